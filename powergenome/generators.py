@@ -448,16 +448,20 @@ def label_retirement_year(
     if df.loc[df["technology_description"].isnull(), :].empty is False:
         df = fill_missing_tech_descriptions(df)
 
-    for tech, life in retirement_ages.items():
-        try:
-            df.loc[df.technology_description == tech, "retirement_year"] = (
-                df.loc[df.technology_description == tech, age_col].dt.year + life
-            )
-        except AttributeError:
-            # This is a bit hacky but for the proposed plants I have an int column
-            df.loc[df.technology_description == tech, "retirement_year"] = (
-                df.loc[df.technology_description == tech, age_col] + life
-            )
+    # Map lifetimes onto every row at once. Technologies without a lifetime keep any
+    # existing retirement year.
+    lifetime = df["technology_description"].map(retirement_ages)
+    try:
+        start_year = df[age_col].dt.year
+    except AttributeError:
+        # This is a bit hacky but for the proposed plants I have an int column
+        start_year = df[age_col]
+    retirement_year = start_year + lifetime
+    if "retirement_year" in df.columns:
+        retirement_year = retirement_year.where(
+            lifetime.notnull(), df["retirement_year"]
+        )
+    df["retirement_year"] = retirement_year
 
     try:
         df.loc[~df["planned_retirement_date"].isnull(), "retirement_year"] = df.loc[
@@ -2,11 +2,12 @@
 Functions to fetch and modify NREL ATB data from PUDL
 """
 
-import copy
 import collections
 import logging
 import operator
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
@@ -17,9 +18,77 @@ from powergenome.price_adjustment import inflation_price_adjustment
 from powergenome.resource_clusters import map_nrel_atb_technology
 from powergenome.util import reverse_dict_of_lists
 
-idx = pd.IndexSlice
 logger = logging.getLogger(__name__)
 
+# Operators that can be used to modify ATB parameters in the settings file
+_OP_MAP = {
+    "add": operator.add,
+    "mul": operator.mul,
+    "truediv": operator.truediv,
+    "sub": operator.sub,
+}
+
+# EIA NEMS O&M for existing plants by plant capacity (MW). Values are in 2017 dollars
+# and bins are found with np.searchsorted(..., side="right"), so each edge is the
+# lower bound (inclusive) of the next bin.
+# https://www.eia.gov/analysis/studies/powerplants/generationcost/pdf/full_report.pdf
+_CC_CAPACITY_BINS = np.array([500, 1000])
+_CC_FIXED_OM = np.array([15.62 * 1000, 9.27 * 1000, 11.68 * 1000])
+_CC_VAR_OM = np.array([4.31, 3.42, 3.37])
+
+# The middle CT bin includes 300 MW.
+_CT_CAPACITY_BINS = np.array([100, np.nextafter(300, np.inf)])
+_CT_FIXED_OM = np.array(
+    [
+        9.0 * 1000 + 5.96 * 1000,
+        6.18 * 1000 + 6.43 * 1000,
+        6.95 * 1000 + 3.99 * 1000,
+    ]
+)
+
+_NGST_CAPACITY_BINS = np.array([500, 1000])
+_NGST_FIXED_OM = np.array(
+    [
+        18.86 * 1000 + 29.73 * 1000,
+        11.57 * 1000 + 17.98 * 1000,
+        10.82 * 1000 + 14.51 * 1000,
+    ]
+)
+
+_COAL_CAPACITY_BINS = np.array([500, 1000, 2000])
+_COAL_FIXED_OM = np.array([44.21 * 1000, 34.02 * 1000, 28.52 * 1000, 33.27 * 1000])
+
+# Technology name fragments for the NEMS/INL O&M blocks, in the order the blocks
+# are applied. A technology matching more than one fragment uses the last match.
+_NEMS_O_M_CATEGORIES = [
+    "Combined Cycle",
+    "Combustion Turbine",
+    "Natural Gas Steam Turbine",
+    "Coal",
+    "Hydroelectric",
+    "Geothermal",
+    "Pumped",
+    "Nuclear",
+]
+
+
+@lru_cache(maxsize=None)
+def _cpi_mult(base_year: int, target_year: int) -> float:
+    "Inflation multiplier from base_year to target_year dollars"
+    return inflation_price_adjustment(1.0, base_year, target_year)
+
+
+@lru_cache(maxsize=16)
+def _read_regional_cost_multipliers(path: Path, mtime_ns: int) -> pd.DataFrame:
+    "Read a regional cost multiplier file, cached on path and modification time"
+    return pd.read_csv(path, index_col=0)
+
+
+def _load_regional_cost_multipliers(path: Path) -> pd.DataFrame:
+    "Copy of a regional cost multiplier file, only read again if it has changed"
+    path = Path(path)
+    return _read_regional_cost_multipliers(path, path.stat().st_mtime_ns).copy()
+
 
 def fetch_atb_costs(
     pudl_engine: sqlalchemy.engine.base.Engine,
@@ -43,7 +112,8 @@ def fetch_atb_costs(
         An optional dataframe with spur costs for offshore wind resources. These costs
         are included in ATB for a fixed distance (same for all sites). PowerGenome
         interconnection costs for offshore sites include a spur cost calculated
-        using actual distance from shore.
+        using actual distance from shore. ATB spur costs are subtracted from
+        OffShoreWind capex. Rows without a matching spur cost keep their ATB capex.
 
     Returns
     -------
@@ -72,6 +142,7 @@ def fetch_atb_costs(
     all_rows = []
     wacc_rows = []
     tech_list = []
+    wacc_keys = []
     techs = settings["atb_new_gen"]
     mod_techs = []
     if settings.get("modified_atb_new_gen"):
@@ -106,10 +177,10 @@ def fetch_atb_costs(
         """
         all_rows.extend(pudl_engine.execute(s, cost_params).fetchall())
 
-        if tech not in tech_list:
-            # ATB2020 summary file provides a single WACC for each technology and a single
-            # tech detail of "*", so need to fetch this separately from other cost params.
-            # Only need to fetch once per technology.
+        if (tech, cost_case) not in wacc_keys:
+            # ATB2020 summary file provides a single WACC for each technology/cost case
+            # and a single tech detail of "*", so need to fetch this separately from
+            # other cost params. Only need to fetch once per technology and cost case.
             wacc_s = f"""
             select technology, cost_case, basis_year, parameter_value
             from technology_costs_nrelatb
@@ -121,6 +192,7 @@ def fetch_atb_costs(
                 AND parameter == "wacc_nominal"
             """
             wacc_rows.extend(pudl_engine.execute(wacc_s).fetchall())
+            wacc_keys.append((tech, cost_case))
 
         tech_list.append(tech)
 
@@ -135,7 +207,9 @@ def fetch_atb_costs(
         s = 'SELECT DISTINCT("technology") from technology_costs_nrelatb WHERE parameter == "wacc_nominal"'
         atb_techs = [x[0] for x in pudl_engine.execute(s).fetchall()]
         battery_wacc_standin = settings.get("atb_battery_wacc")
-        battery_tech = [x for x in techs if x[0] == "Battery"][0]
+        battery_cost_cases = sorted(
+            set(x[2] for x in techs + mod_techs if x[0] == "Battery")
+        )
         if isinstance(battery_wacc_standin, float):
             if battery_wacc_standin > 0.1:
                 logger.warning(
@@ -143,7 +217,8 @@ def fetch_atb_costs(
                     " very high. Check settings parameter `atb_battery_wacc`."
                 )
             battery_wacc_rows = [
-                (battery_tech[0], battery_tech[2], year, battery_wacc_standin)
+                ("Battery", cost_case, year, battery_wacc_standin)
+                for cost_case in battery_cost_cases
                 for year in range(2017, 2051)
             ]
             wacc_rows.extend(battery_wacc_rows)
@@ -167,7 +242,8 @@ def fetch_atb_costs(
             """
             b_rows = pudl_engine.execute(wacc_s).fetchall()
             battery_wacc_rows = [
-                (battery_tech[0], battery_tech[2], b_row[2], b_row[3])
+                ("Battery", cost_case, b_row[2], b_row[3])
+                for cost_case in battery_cost_cases
                 for b_row in b_rows
             ]
             wacc_rows.extend(battery_wacc_rows)
@@ -218,34 +294,60 @@ def fetch_atb_costs(
             atb_costs[col] = 0
 
     atb_target_year = settings["target_usd_year"]
-    atb_costs[usd_columns] = atb_costs.apply(
-        lambda row: inflation_price_adjustment(
-            row[usd_columns], base_year=row["dollar_year"], target_year=atb_target_year
-        ),
-        axis=1,
+    cpi_mult = atb_costs["dollar_year"].map(
+        lambda year: _cpi_mult(year, atb_target_year)
     )
+    atb_costs[usd_columns] = atb_costs[usd_columns].mul(cpi_mult, axis=0)
 
     if any("PV" in tech for tech in tech_list) and atb_year == 2019:
         print("Inflating ATB 2019 PV costs from DC to AC")
+        pv_techs = [t for t in atb_costs["technology"].unique() if "PV" in t]
         atb_costs.loc[
-            atb_costs["technology"].str.contains("PV"),
+            atb_costs["technology"].isin(pv_techs),
             ["capex_mw", "fixed_o_m_mw", "variable_o_m_mwh"],
         ] *= settings.get("pv_ac_dc_ratio", 1.3)
     elif atb_year > 2019:
         logger.info("PV costs are already in AC units, not inflating the cost.")
 
-    if offshore_spur_costs is not None and "OffShoreWind" in atb_costs["technology"]:
+    if (
+        offshore_spur_costs is not None
+        and atb_costs["technology"].eq("OffShoreWind").any()
+    ):
+        # Align spur costs with the ATB rows using a left merge instead of setting
+        # and resetting an index on the full cost table.
         idx_cols = ["technology", "tech_detail", "cost_case", "basis_year"]
-        offshore_spur_costs = offshore_spur_costs.set_index(idx_cols)
-        atb_costs = atb_costs.set_index(idx_cols)
-
-        atb_costs.loc[idx["OffShoreWind", :, :, :], "capex_mw"] = (
-            atb_costs.loc[idx["OffShoreWind", :, :, :], "capex_mw"]  # .values
-            - offshore_spur_costs.loc[
-                idx["OffShoreWind", :, :, :], "capex_mw"
-            ]  # .values
+        spur_capex = (
+            atb_costs[idx_cols]
+            .merge(
+                offshore_spur_costs[idx_cols + ["capex_mw"]].drop_duplicates(
+                    subset=idx_cols
+                ),
+                on=idx_cols,
+                how="left",
+            )["capex_mw"]
+            .to_numpy()
         )
-        atb_costs = atb_costs.reset_index()
+        offshore = (atb_costs["technology"] == "OffShoreWind").to_numpy()
+
+        # Keep the ATB capex of offshore rows without a spur cost rather than making
+        # it NaN
+        missing_spur = offshore & np.isnan(spur_capex)
+        if missing_spur.any():
+            missing_keys = (
+                atb_costs.loc[missing_spur, idx_cols]
+                .drop_duplicates()
+                .to_records(index=False)
+                .tolist()
+            )
+            logger.warning(
+                "No ATB offshore spur costs were found for "
+                f"{missing_keys}. Their capex still includes ATB spur costs."
+            )
+        atb_costs.loc[offshore, "capex_mw"] -= np.nan_to_num(spur_capex[offshore])
+
+    # A handful of repeated strings, so categories are smaller and faster to filter
+    for col in ["technology", "tech_detail", "cost_case"]:
+        atb_costs[col] = atb_costs[col].astype("category")
 
     return atb_costs
 
@@ -269,16 +371,17 @@ def fetch_atb_offshore_spur_costs(
         Total offshore spur line capex from ATB for each technology/tech_detail/
         basis_year/cost_case combination.
     """
-    spur_costs = pd.read_sql_table("offshore_spur_costs_nrelatb", pudl_engine)
-    spur_costs = spur_costs.loc[spur_costs["atb_year"] == settings["atb_data_year"], :]
+    s = """
+        SELECT technology, tech_detail, cost_case, basis_year, capex_mw, dollar_year
+        FROM offshore_spur_costs_nrelatb
+        WHERE atb_year == ?
+    """
+    spur_costs = pd.read_sql_query(s, pudl_engine, params=[settings["atb_data_year"]])
 
     atb_target_year = settings["target_usd_year"]
 
-    spur_costs["capex_mw"] = spur_costs.apply(
-        lambda row: inflation_price_adjustment(
-            row["capex_mw"], base_year=row["dollar_year"], target_year=atb_target_year
-        ),
-        axis=1,
+    spur_costs["capex_mw"] = spur_costs["capex_mw"] * spur_costs["dollar_year"].map(
+        lambda year: _cpi_mult(year, atb_target_year)
     )
 
     # ATB assumes a 30km distance for offshore spur. Normalize to per mile
@@ -309,8 +412,14 @@ def fetch_atb_heat_rates(
         ['technology', 'tech_detail', 'basis_year', 'heat_rate']
     """
 
-    heat_rates = pd.read_sql_table("technology_heat_rates_nrelatb", pudl_engine)
-    heat_rates = heat_rates.loc[heat_rates["atb_year"] == settings["atb_data_year"], :]
+    s = """
+        SELECT technology, tech_detail, basis_year, heat_rate
+        FROM technology_heat_rates_nrelatb
+        WHERE atb_year == ?
+    """
+    heat_rates = pd.read_sql_query(s, pudl_engine, params=[settings["atb_data_year"]])
+    for col in ["technology", "tech_detail"]:
+        heat_rates[col] = heat_rates[col].astype("category")
 
     return heat_rates
 
@@ -343,337 +452,258 @@ def atb_fixed_var_om_existing(
     -------
     DataFrame
         Same as incoming "results" dataframe but with new columns
-        "Fixed_OM_cost_per_MWyr" and "Var_OM_cost_per_MWh"
+        "Fixed_OM_cost_per_MWyr" and "Var_OM_cost_per_MWh". The index is reset and
+        rows keep the order of "results" rather than being sorted by plant_id_eia
+        and technology.
     """
     logger.info("Adding fixed and variable O&M for existing plants")
     techs = settings["eia_atb_tech_map"]
     existing_year = settings["atb_existing_year"]
+    target_usd_year = settings["target_usd_year"]
+    capacity_col = settings["capacity_col"]
+
+    # NEMS and INL O&M values are in 2017 and 2015 dollars. Find the inflation
+    # multipliers once and apply them to every plant.
+    cpi_mult_2017 = _cpi_mult(2017, target_usd_year)
+    cpi_mult_2015 = _cpi_mult(2015, target_usd_year)
 
     # ATB string is <technology>_<tech_detail>
     techs = {eia: atb.split("_") for eia, atb in techs.items()}
-    df_list = []
-    grouped_results = results.reset_index().groupby(
-        ["plant_id_eia", "technology"], as_index=False
-    )
-    for group, _df in grouped_results:
-
-        plant_id, eia_tech = group
-        existing_hr = _df["heat_rate_mmbtu_mwh"].mean()
-        try:
-            atb_tech, tech_detail = techs[eia_tech]
-        except KeyError:
-            if eia_tech in settings["tech_groups"]:
-                raise KeyError(
-                    f"{eia_tech} is defined in 'tech_groups' but doesn't have a "
-                    "corresponding ATB technology in 'eia_atb_tech_map'"
-                )
 
-            else:
-                raise KeyError(
-                    f"{eia_tech} doesn't have a corresponding ATB technology in "
-                    "'eia_atb_tech_map'"
-                )
+    missing_techs = [
+        t for t in results["technology"].dropna().unique() if t not in techs
+    ]
+    if missing_techs:
+        eia_tech = missing_techs[0]
+        if eia_tech in settings["tech_groups"]:
+            raise KeyError(
+                f"{eia_tech} is defined in 'tech_groups' but doesn't have a "
+                "corresponding ATB technology in 'eia_atb_tech_map'"
+            )
 
-        try:
-            new_build_hr = (
-                atb_hr_df.query(
-                    "technology==@atb_tech & tech_detail==@tech_detail"
-                    "& basis_year==@existing_year"
-                )
-                .squeeze()
-                .at["heat_rate"]
+        else:
+            raise KeyError(
+                f"{eia_tech} doesn't have a corresponding ATB technology in "
+                "'eia_atb_tech_map'"
             )
-        except ValueError:
-            # Not all technologies have a heat rate. If they don't, just set both values
-            # to 1
-            existing_hr = 1
-            new_build_hr = 1
-        try:
-            s = f"""
-                select parameter_value
-                from technology_costs_nrelatb
-                where
-                    technology == "{atb_tech}"
-                    AND tech_detail == "{tech_detail}"
-                    AND basis_year == "{existing_year}"
-                    AND financial_case == "Market"
-                    AND cost_case == "Mid"
-                    AND atb_year == "{settings['atb_data_year']}"
-                    AND parameter == "variable_o_m_mwh"
-                
-                """
-            atb_var_om_mwh = pudl_engine.execute(s).fetchall()[0][0]
-        except IndexError:
-            # logger.warning(f"No variable O&M for {atb_tech}")
-            atb_var_om_mwh = 0
-
-        try:
-            s = f"""
-                select parameter_value
-                from technology_costs_nrelatb
-                where
-                    technology == "{atb_tech}"
-                    AND tech_detail == "{tech_detail}"
-                    AND basis_year == "{existing_year}"
-                    AND financial_case == "Market"
-                    AND cost_case == "Mid"
-                    AND atb_year == "{settings['atb_data_year']}"
-                    AND parameter == "fixed_o_m_mw"
-                
-                """
-            atb_fixed_om_mw_yr = pudl_engine.execute(s).fetchall()[0][0]
-        except IndexError:
-            # logger.warning(f"No fixed O&M for {atb_tech}")
-            atb_fixed_om_mw_yr = 0
-
-        nems_o_m_techs = [
-            "Combined Cycle",
-            "Combustion Turbine",
-            "Coal",
-            "Steam Turbine",
-            "Hydroelectric",
-            "Geothermal",
-            "Nuclear",
-        ]
-        if any(t in eia_tech for t in nems_o_m_techs):
-            # Change CC and CT O&M to EIA NEMS values, which are much higher for CCs and
-            # lower for CTs than a heat rate & linear mulitpler correction to the ATB
-            # values.
-            # Add natural gas steam turbine O&M.
-            # Also using the new values for coal plants, assuming 40-50 yr age and half
-            # FGD
-            # https://www.eia.gov/analysis/studies/powerplants/generationcost/pdf/full_report.pdf
-            # logger.info(f"Using NEMS values for {eia_tech} fixed/variable O&M")
-            target_usd_year = settings["target_usd_year"]
-            simple_o_m = {
-                "Combined Cycle": {
-                    # "fixed_o_m_mw": inflation_price_adjustment(
-                    #     13.08 * 1000, 2017, target_usd_year
-                    # ),
-                    # "variable_o_m_mwh": inflation_price_adjustment(
-                    #     3.91, 2017, target_usd_year
-                    # )
-                },
-                # "Combustion Turbine": {
-                #     # This includes both the Fixed O&M and Capex. Capex includes
-                #     # variable O&M, which is split out in the calculations below.
-                #     "fixed_o_m_mw": inflation_price_adjustment(
-                #         (5.33 + 6.90) * 1000, 2017, target_usd_year
-                #     ),
-                #     "variable_o_m_mwh": 0,
-                # },
-                "Natural Gas Steam Turbine": {
-                    # NEMS documenation splits capex and fixed O&M across 2 tables
-                    # "fixed_o_m_mw": inflation_price_adjustment(
-                    #     (15.96 + 24.68) * 1000, 2017, target_usd_year
-                    # ),
-                    "variable_o_m_mwh": inflation_price_adjustment(
-                        1.0, 2017, target_usd_year
-                    )
-                },
-                "Coal": {
-                    # "fixed_o_m_mw": inflation_price_adjustment(
-                    #     ((22.2 + 27.88) / 2 + 46.01) * 1000, 2017, target_usd_year
-                    # ),
-                    "variable_o_m_mwh": inflation_price_adjustment(
-                        1.78, 2017, target_usd_year
-                    )
-                },
-                "Conventional Hydroelectric": {
-                    "fixed_o_m_mw": inflation_price_adjustment(
-                        44.56 * 1000, 2017, target_usd_year
-                    ),
-                    "variable_o_m_mwh": 0,
-                },
-                "Geothermal": {
-                    "fixed_o_m_mw": inflation_price_adjustment(
-                        198.04 * 1000, 2017, target_usd_year
-                    ),
-                    "variable_o_m_mwh": 0,
-                },
-                "Pumped Hydro": {
-                    "fixed_o_m_mw": inflation_price_adjustment(
-                        (23.63 + 14.83) * 1000, 2017, target_usd_year
-                    ),
-                    "variable_o_m_mwh": 0,
-                },
-            }
 
-            if "Combined Cycle" in eia_tech:
-                # https://www.eia.gov/analysis/studies/powerplants/generationcost/pdf/full_report.pdf
-                plant_capacity = _df[settings["capacity_col"]].sum()
-                assert plant_capacity > 0
-                if plant_capacity < 500:
-                    fixed = 15.62 * 1000
-                    variable = 4.31
-                elif 500 <= plant_capacity < 1000:
-                    fixed = 9.27 * 1000
-                    variable = 3.42
-                else:
-                    fixed = 11.68 * 1000
-                    variable = 3.37
-
-                _df["Fixed_OM_cost_per_MWyr"] = inflation_price_adjustment(
-                    fixed, 2017, target_usd_year
-                )
-                _df["Var_OM_cost_per_MWh"] = inflation_price_adjustment(
-                    variable, 2017, target_usd_year
-                )
+    # Fetch ATB O&M for every mapped technology in a single query rather than once
+    # per plant. Keep the first value of each parameter.
+    atb_tech_names = tuple(sorted({atb[0] for atb in techs.values()}))
+    s = f"""
+        select technology, tech_detail, parameter, parameter_value
+        from technology_costs_nrelatb
+        where
+            technology IN ({','.join('?'*len(atb_tech_names))})
+            AND basis_year == "{existing_year}"
+            AND financial_case == "Market"
+            AND cost_case == "Mid"
+            AND atb_year == "{settings['atb_data_year']}"
+            AND parameter IN ("variable_o_m_mwh", "fixed_o_m_mw")
+        """
+    atb_om_lookup = {}
+    for atb_tech, tech_detail, parameter, value in pudl_engine.execute(
+        s, atb_tech_names
+    ).fetchall():
+        atb_om_lookup.setdefault((atb_tech, tech_detail, parameter), value)
+
+    # Not all technologies have a heat rate, and a technology with multiple heat rates
+    # is ambiguous. In either case the existing/new-build heat rate ratio is set to 1.
+    hr_lookup = (
+        atb_hr_df.loc[atb_hr_df["basis_year"] == existing_year, :]
+        .drop_duplicates(subset=["technology", "tech_detail"], keep=False)
+        .set_index(["technology", "tech_detail"])["heat_rate"]
+        .to_dict()
+    )
 
-            if "Combustion Turbine" in eia_tech:
-                # need to adjust the EIA fixed/variable costs because they have no
-                # variable cost per MWh for existing CTs but they do have per MWh for
-                # new build. Assume $11/MWh from new-build and 4% CF:
-                # (11*8760*0.04/1000)=$3.85/kW-yr. Scale the new-build variable
-                # (~$11/MWh) by relative heat rate and subtract a /kW-yr value as
-                # calculated above from the FOM.
-                # Based on conversation with Jesse J. on Dec 20, 2019.
-                plant_capacity = _df[settings["capacity_col"]].sum()
-                op, op_value = (
-                    settings.get("atb_modifiers", {})
-                    .get("ngct", {})
-                    .get("Var_OM_cost_per_MWh", (None, None))
-                )
+    # Each EIA technology maps to a single ATB technology, so the lookups only need
+    # to be done once per EIA technology.
+    atb_fixed_om_mw_yr = results["technology"].map(
+        {
+            eia: atb_om_lookup.get((atb[0], atb[1], "fixed_o_m_mw"), 0)
+            for eia, atb in techs.items()
+        }
+    )
+    atb_var_om_mwh = (
+        results["technology"]
+        .map(
+            {
+                eia: atb_om_lookup.get((atb[0], atb[1], "variable_o_m_mwh"), 0)
+                for eia, atb in techs.items()
+            }
+        )
+        .to_numpy()
+    )
+    new_build_hr = (
+        results["technology"]
+        .map(
+            {
+                eia: hr_lookup[(atb[0], atb[1])]
+                for eia, atb in techs.items()
+                if (atb[0], atb[1]) in hr_lookup
+            }
+        )
+        .to_numpy(dtype=float)
+    )
 
-                if op:
-                    f = operator.attrgetter(op)
-                    atb_var_om_mwh = f(operator)(atb_var_om_mwh, op_value)
+    # Plant-level values are broadcast back to every generator row so that O&M can
+    # be calculated for all rows at once and assigned directly to the results. Plant
+    # ids are usually part of the index, so group on the index values instead of
+    # resetting the index. Group order doesn't matter for transforms.
+    if "plant_id_eia" in results.index.names:
+        plant_ids = results.index.get_level_values("plant_id_eia")
+    else:
+        plant_ids = results["plant_id_eia"]
+    group_keys = [np.asarray(plant_ids), results["technology"].to_numpy()]
+    grouped_results = results.groupby(group_keys, sort=False)
+    existing_hr = grouped_results["heat_rate_mmbtu_mwh"].transform("mean").to_numpy()
+    plant_capacity = grouped_results[capacity_col].transform("sum").to_numpy()
+
+    hr_ratio = np.where(np.isnan(new_build_hr), 1, existing_hr / new_build_hr)
+
+    # Match technology names once per unique name and broadcast the integer codes
+    # back to rows, rather than scanning every row with str.contains for each block.
+    # The extra last entry is for missing technologies (factorize code of -1).
+    tech_codes, unique_techs = pd.factorize(results["technology"])
+    unique_category = np.full(len(unique_techs) + 1, -1)
+    for code, name in enumerate(_NEMS_O_M_CATEGORIES):
+        matches = np.array([name in tech for tech in unique_techs] + [False])
+        unique_category[matches] = code
+    nems_category = unique_category[tech_codes]
+    nems_code = {name: code for code, name in enumerate(_NEMS_O_M_CATEGORIES)}
+
+    # Every steam turbine is treated as a NEMS technology, although only natural
+    # gas steam turbines have NEMS O&M values.
+    is_steam_turbine = np.array(
+        ["Steam Turbine" in tech for tech in unique_techs] + [False]
+    )[tech_codes]
+    is_nems = (nems_category >= 0) | is_steam_turbine
+
+    # Technologies without NEMS values use ATB fixed O&M and variable O&M scaled by
+    # relative heat rate.
+    fixed = np.where(is_nems, np.nan, atb_fixed_om_mw_yr)
+    variable = np.where(is_nems, np.nan, atb_var_om_mwh * hr_ratio)
+
+    # Change CC and CT O&M to EIA NEMS values, which are much higher for CCs and
+    # lower for CTs than a heat rate & linear mulitpler correction to the ATB
+    # values.
+    # Add natural gas steam turbine O&M.
+    # Also using the new values for coal plants, assuming 40-50 yr age and half
+    # FGD
+    # https://www.eia.gov/analysis/studies/powerplants/generationcost/pdf/full_report.pdf
+    is_cc = nems_category == nems_code["Combined Cycle"]
+    if is_cc.any():
+        # https://www.eia.gov/analysis/studies/powerplants/generationcost/pdf/full_report.pdf
+        assert (plant_capacity[is_cc] > 0).all()
+        cc_bin = np.searchsorted(_CC_CAPACITY_BINS, plant_capacity, side="right")
+        cc_fixed = _CC_FIXED_OM[cc_bin]
+        cc_variable = _CC_VAR_OM[cc_bin]
+
+        fixed = np.where(is_cc, cc_fixed * cpi_mult_2017, fixed)
+        variable = np.where(is_cc, cc_variable * cpi_mult_2017, variable)
+
+    is_ct = nems_category == nems_code["Combustion Turbine"]
+    if is_ct.any():
+        # need to adjust the EIA fixed/variable costs because they have no
+        # variable cost per MWh for existing CTs but they do have per MWh for
+        # new build. Assume $11/MWh from new-build and 4% CF:
+        # (11*8760*0.04/1000)=$3.85/kW-yr. Scale the new-build variable
+        # (~$11/MWh) by relative heat rate and subtract a /kW-yr value as
+        # calculated above from the FOM.
+        # Based on conversation with Jesse J. on Dec 20, 2019.
+        op, op_value = (
+            settings.get("atb_modifiers", {})
+            .get("ngct", {})
+            .get("Var_OM_cost_per_MWh", (None, None))
+        )
 
-                variable = atb_var_om_mwh  # * (existing_hr / new_build_hr)
+        ct_variable = atb_var_om_mwh
+        if op:
+            ct_variable = _OP_MAP[op](ct_variable, op_value)
 
-                if plant_capacity < 100:
-                    annual_capex = 9.0 * 1000
-                    fixed = annual_capex + 5.96 * 1000
-                elif 100 <= plant_capacity <= 300:
-                    annual_capex = 6.18 * 1000
-                    fixed = annual_capex + 6.43 * 1000
-                else:
-                    annual_capex = 6.95 * 1000
-                    fixed = annual_capex + 3.99 * 1000
+        ct_bin = np.searchsorted(_CT_CAPACITY_BINS, plant_capacity, side="right")
+        ct_fixed = _CT_FIXED_OM[ct_bin] - (ct_variable * 8760 * 0.04)
 
-                fixed = fixed - (variable * 8760 * 0.04)
+        fixed = np.where(is_ct, ct_fixed * cpi_mult_2017, fixed)
+        variable = np.where(is_ct, ct_variable * cpi_mult_2017, variable)
 
-                _df["Fixed_OM_cost_per_MWyr"] = inflation_price_adjustment(
-                    fixed, 2017, target_usd_year
-                )
-                _df["Var_OM_cost_per_MWh"] = inflation_price_adjustment(
-                    variable, 2017, target_usd_year
-                )
+    is_ngst = nems_category == nems_code["Natural Gas Steam Turbine"]
+    if is_ngst.any():
+        # https://www.eia.gov/analysis/studies/powerplants/generationcost/pdf/full_report.pdf
+        assert (plant_capacity[is_ngst] > 0).all()
+        ngst_bin = np.searchsorted(_NGST_CAPACITY_BINS, plant_capacity, side="right")
+        ngst_fixed = _NGST_FIXED_OM[ngst_bin]
 
-            if "Natural Gas Steam Turbine" in eia_tech:
-                # https://www.eia.gov/analysis/studies/powerplants/generationcost/pdf/full_report.pdf
-                plant_capacity = _df[settings["capacity_col"]].sum()
-                assert plant_capacity > 0
-                if plant_capacity < 500:
-                    annual_capex = 18.86 * 1000
-                    fixed = annual_capex + 29.73 * 1000
-                elif 500 <= plant_capacity < 1000:
-                    annual_capex = 11.57 * 1000
-                    fixed = annual_capex + 17.98 * 1000
-                else:
-                    annual_capex = 10.82 * 1000
-                    fixed = annual_capex + 14.51 * 1000
-
-                _df["Fixed_OM_cost_per_MWyr"] = inflation_price_adjustment(
-                    fixed, 2017, target_usd_year
-                )
-                _df["Var_OM_cost_per_MWh"] = simple_o_m["Natural Gas Steam Turbine"][
-                    "variable_o_m_mwh"
-                ]
+        fixed = np.where(is_ngst, ngst_fixed * cpi_mult_2017, fixed)
+        variable = np.where(is_ngst, cpi_mult_2017, variable)
 
-            if "Coal" in eia_tech:
+    is_coal = nems_category == nems_code["Coal"]
+    if is_coal.any():
+        assert (plant_capacity[is_coal] > 0).all()
 
-                plant_capacity = _df[settings["capacity_col"]].sum()
-                assert plant_capacity > 0
+        age = pd.Series(
+            settings["model_year"]
+            - results["operating_date"].dt.year.to_numpy(dtype=float)
+        )
+        age = age.fillna(age.groupby(group_keys, sort=False).transform("mean"))
+        age = age.fillna(40).to_numpy()
 
-                age = settings["model_year"] - _df.operating_date.dt.year
-                age = age.fillna(age.mean())
-                age = age.fillna(40)
+        # https://www.eia.gov/analysis/studies/powerplants/generationcost/pdf/full_report.pdf
+        annual_capex = (16.53 + (0.126 * age) + (5.68 * 0.5)) * 1000
 
-                # https://www.eia.gov/analysis/studies/powerplants/generationcost/pdf/full_report.pdf
-                annual_capex = (16.53 + (0.126 * age) + (5.68 * 0.5)) * 1000
+        coal_bin = np.searchsorted(_COAL_CAPACITY_BINS, plant_capacity, side="right")
+        coal_fixed = _COAL_FIXED_OM[coal_bin]
 
-                if plant_capacity < 500:
-                    fixed = 44.21 * 1000
-                elif 500 <= plant_capacity < 1000:
-                    fixed = 34.02 * 1000
-                elif 1000 <= plant_capacity < 2000:
-                    fixed = 28.52 * 1000
-                else:
-                    fixed = 33.27 * 1000
+        fixed = np.where(is_coal, (coal_fixed + annual_capex) * cpi_mult_2017, fixed)
+        variable = np.where(is_coal, 1.78 * cpi_mult_2017, variable)
 
-                _df["Fixed_OM_cost_per_MWyr"] = inflation_price_adjustment(
-                    fixed + annual_capex, 2017, target_usd_year
-                )
-                _df["Var_OM_cost_per_MWh"] = simple_o_m["Coal"]["variable_o_m_mwh"]
-            if "Hydroelectric" in eia_tech:
-                _df["Fixed_OM_cost_per_MWyr"] = simple_o_m[
-                    "Conventional Hydroelectric"
-                ]["fixed_o_m_mw"]
-                _df["Var_OM_cost_per_MWh"] = simple_o_m["Conventional Hydroelectric"][
-                    "variable_o_m_mwh"
-                ]
-            if "Geothermal" in eia_tech:
-                _df["Fixed_OM_cost_per_MWyr"] = simple_o_m["Geothermal"]["fixed_o_m_mw"]
-                _df["Var_OM_cost_per_MWh"] = simple_o_m["Geothermal"][
-                    "variable_o_m_mwh"
-                ]
-            if "Pumped" in eia_tech:
-                _df["Fixed_OM_cost_per_MWyr"] = simple_o_m["Pumped Hydro"][
-                    "fixed_o_m_mw"
-                ]
-                _df["Var_OM_cost_per_MWh"] = simple_o_m["Pumped Hydro"][
-                    "variable_o_m_mwh"
-                ]
-            if "Nuclear" in eia_tech:
-                num_units = len(_df)
-                plant_capacity = _df[settings["capacity_col"]].sum()
-
-                # Operating costs for different size/num units in 2016 INL report
-                # "Economic and Market Challenges Facing the U.S. Nuclear Fleet"
-                # https://gain.inl.gov/Shared%20Documents/Economics-Nuclear-Fleet.pdf,
-                # table 1. Average of the two costs are used in each case.
-                # The costs in that report include fuel and VOM. Assume $0.66/mmbtu
-                # and $2.32/MWh plus 90% CF (ATB 2020) to get the costs below.
-                # The INL report doesn't give a dollar year for costs, assume 2015.
-                if num_units == 1 and plant_capacity < 900:
-                    fixed = 315000
-                elif num_units == 1 and plant_capacity >= 900:
-                    fixed = 252000
-                else:
-                    fixed = 177000
-                # age = (settings["model_year"] - _df.operating_date.dt.year).values
-                # age = age.fillna(age.mean())
-                # age = age.fillna(40)
-                # EIA, 2020, "Assumptions to Annual Energy Outlook, Electricity Market Module,"
-                # Available: https://www.eia.gov/outlooks/aeo/assumptions/pdf/electricity.pdf
-                # fixed = np.ones_like(age)
-                # fixed[age < 30] *= 27 * 1000
-                # fixed[age >= 30] *= (27+37) * 1000
-
-                _df["Fixed_OM_cost_per_MWyr"] = inflation_price_adjustment(
-                    fixed, 2015, target_usd_year
-                )
-                _df["Var_OM_cost_per_MWh"] = atb_var_om_mwh * (
-                    existing_hr / new_build_hr
-                )
+    simple_o_m = {
+        "Hydroelectric": 44.56 * 1000 * cpi_mult_2017,
+        "Geothermal": 198.04 * 1000 * cpi_mult_2017,
+        "Pumped": (23.63 + 14.83) * 1000 * cpi_mult_2017,
+    }
+    for name, simple_fixed in simple_o_m.items():
+        is_simple = nems_category == nems_code[name]
+        fixed = np.where(is_simple, simple_fixed, fixed)
+        variable = np.where(is_simple, 0, variable)
+
+    is_nuclear = nems_category == nems_code["Nuclear"]
+    if is_nuclear.any():
+        num_units = grouped_results["technology"].transform("count").to_numpy()
+
+        # Operating costs for different size/num units in 2016 INL report
+        # "Economic and Market Challenges Facing the U.S. Nuclear Fleet"
+        # https://gain.inl.gov/Shared%20Documents/Economics-Nuclear-Fleet.pdf,
+        # table 1. Average of the two costs are used in each case.
+        # The costs in that report include fuel and VOM. Assume $0.66/mmbtu
+        # and $2.32/MWh plus 90% CF (ATB 2020) to get the costs below.
+        # The INL report doesn't give a dollar year for costs, assume 2015.
+        nuclear_fixed = np.select(
+            [
+                (num_units == 1) & (plant_capacity < 900),
+                (num_units == 1) & (plant_capacity >= 900),
+            ],
+            [315000, 252000],
+            177000,
+        )
 
-        else:
-            _df["Fixed_OM_cost_per_MWyr"] = atb_fixed_om_mw_yr
-            _df["Var_OM_cost_per_MWh"] = atb_var_om_mwh * (existing_hr / new_build_hr)
+        fixed = np.where(is_nuclear, nuclear_fixed * cpi_mult_2015, fixed)
+        variable = np.where(is_nuclear, atb_var_om_mwh * hr_ratio, variable)
 
-        df_list.append(_df)
+    # A technology can contain a NEMS name without matching any of the NEMS O&M
+    # categories (e.g. a steam turbine that doesn't burn natural gas)
+    missing_fixed = ~np.isfinite(fixed)
+    if missing_fixed.any():
+        missing_techs = pd.unique(results["technology"].to_numpy()[missing_fixed])
+        raise ValueError(
+            f"Fixed O&M costs could not be calculated for {list(missing_techs)}"
+        )
 
-    mod_results = pd.concat(df_list, ignore_index=True)
-    # mod_results = mod_results.sort_values(["model_region", "technology", "cluster"])
-    mod_results.loc[:, "Fixed_OM_cost_per_MWyr"] = mod_results.loc[
-        :, "Fixed_OM_cost_per_MWyr"
-    ].astype(int)
-    mod_results.loc[:, "Var_OM_cost_per_MWh"] = mod_results.loc[
-        :, "Var_OM_cost_per_MWh"
-    ]
+    results = results.reset_index()
+    results["Fixed_OM_cost_per_MWyr"] = np.rint(fixed).astype(np.int64)
+    results["Var_OM_cost_per_MWh"] = variable
 
-    return mod_results
+    return results
 
 
 def single_generator_row(atb_costs_hr, new_gen_type, model_year_range):
@@ -695,7 +725,32 @@ def single_generator_row(atb_costs_hr, new_gen_type, model_year_range):
         period.
     """
 
-    technology, tech_detail, cost_case, size_mw = new_gen_type
+    return _batch_generator_rows(atb_costs_hr, [new_gen_type], model_year_range)
+
+
+def _batch_generator_rows(atb_costs_hr, new_gen_types, model_year_range):
+    """Create data rows with NREL ATB costs and performance for multiple technologies
+
+    Values are averaged over the model years for every technology/tech_detail/cost_case
+    in a single groupby rather than filtering the ATB data once per technology.
+
+    Parameters
+    ----------
+    atb_costs_hr : dataframe
+        Data from the sqlite tables of both resources costs and heat rates
+    new_gen_types : list
+        Lists of [technology, tech_detail, cost_case, size_mw] for each resource
+    model_year_range : list
+        All of the years that should be averaged over
+
+    Returns
+    -------
+    dataframe
+        One row per resource in `new_gen_types` with average cost and performance
+        values over the study period.
+    """
+
+    key_cols = ["technology", "tech_detail", "cost_case"]
     numeric_cols = [
         "basis_year",
         "fixed_o_m_mw",
@@ -710,56 +765,106 @@ def single_generator_row(atb_costs_hr, new_gen_type, model_year_range):
         "wacc_nominal",
         "heat_rate",
     ]
-    s = atb_costs_hr.loc[
-        (atb_costs_hr["technology"] == technology)
-        & (atb_costs_hr["tech_detail"] == tech_detail)
-        & (atb_costs_hr["basis_year"].isin(model_year_range)),
-        numeric_cols,
-    ].mean()
-    cols = ["technology", "cost_case", "tech_detail"] + numeric_cols
-    row = pd.DataFrame([technology, cost_case, tech_detail] + s.to_list(), index=cols).T
+    avg_values = (
+        atb_costs_hr.loc[atb_costs_hr["basis_year"].isin(model_year_range), :]
+        .groupby(key_cols, observed=True)[numeric_cols]
+        .mean()
+    )
+    gen_idx = pd.MultiIndex.from_tuples(
+        [tuple(new_gen[:3]) for new_gen in new_gen_types], names=key_cols
+    )
+    rows = avg_values.reindex(gen_idx).reset_index()
+    rows["Cap_size"] = [new_gen[3] for new_gen in new_gen_types]
 
-    row["Cap_size"] = size_mw
+    cols = ["technology", "cost_case", "tech_detail"] + numeric_cols + ["Cap_size"]
 
-    return row
+    return rows[cols]
 
 
 def investment_cost_calculator(capex, wacc, cap_rec_years):
     capex = np.asarray(capex, dtype=float)
     wacc = np.asarray(wacc, dtype=float)
+    cap_rec_years = np.asarray(cap_rec_years, dtype=float)
 
-    for variable in capex, wacc, cap_rec_years:
-        if np.isnan(variable).any():
-            raise ValueError(f"Investment costs contains nan values")
+    if np.isnan(capex).any() or np.isnan(wacc).any() or np.isnan(cap_rec_years).any():
+        raise ValueError(f"Investment costs contains nan values")
 
-    inv_cost = capex * (
-        np.exp(wacc * cap_rec_years)
-        * (np.exp(wacc) - 1)
-        / (np.exp(wacc * cap_rec_years) - 1)
-    )
+    # Share the exp(wacc * years) term and use expm1 for exp(wacc) - 1
+    exp_wacc_years = np.exp(wacc * cap_rec_years)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv_cost = capex * exp_wacc_years * np.expm1(wacc) / (exp_wacc_years - 1)
+
+    # The annuity is 0/0 with no cost of capital, where it's just straight-line
+    if (wacc == 0).any():
+        inv_cost = np.where(wacc == 0, capex / cap_rec_years, inv_cost)
+
+    # Return a scalar rather than a 0-d array for scalar inputs
+    if inv_cost.ndim == 0:
+        inv_cost = inv_cost[()]
 
     return inv_cost
 
 
-def regional_capex_multiplier(df, region, region_map, tech_map, regional_multipliers):
+def regional_capex_multiplier(df, region_map, tech_map, regional_multipliers):
+    """Apply regional capital cost multipliers to new resources in all model regions
 
-    cost_region = region_map[region]
-    tech_multiplier = regional_multipliers.loc[cost_region, :].squeeze()
-    avg_multiplier = tech_multiplier.mean()
+    Parameters
+    ----------
+    df : DataFrame
+        New resources with columns "technology", "region", "Inv_cost_per_MWyr", and
+        "Inv_cost_per_MWhyr".
+    region_map : dict
+        Mapping of model region to cost multiplier region.
+    tech_map : dict
+        Mapping of ATB technology name fragments to cost multiplier technologies.
+    regional_multipliers : DataFrame
+        Cost multipliers with cost regions as the index and technologies as columns.
+        Missing values are filled with the average multiplier of the cost region.
 
-    tech_multiplier = tech_multiplier.fillna(avg_multiplier)
+    Returns
+    -------
+    DataFrame
+        The input dataframe with investment costs multiplied by the regional cost
+        multiplier and a new column "regional_cost_multiplier". Technologies that
+        don't match `tech_map` have a multiplier of NaN.
 
-    tech_multiplier_map = {}
-    for atb_tech, eia_tech in tech_map.items():
-        if df["technology"].str.contains(atb_tech).sum() > 0:
-            full_atb_tech = df.loc[
-                df["technology"].str.contains(atb_tech).idxmax(), "technology"
-            ]
-            tech_multiplier_map[full_atb_tech] = tech_multiplier.at[eia_tech]
+    Raises
+    ------
+    KeyError
+        A model region or multiplier technology doesn't have regional cost multipliers.
+    """
 
-    df["Inv_cost_per_MWyr"] *= df["technology"].map(tech_multiplier_map)
-    df["Inv_cost_per_MWhyr"] *= df["technology"].map(tech_multiplier_map)
-    df["regional_cost_multiplier"] = df["technology"].map(tech_multiplier_map)
+    # Match against unique technology names rather than scanning every row. The
+    # matches are the same in every region.
+    unique_techs = df["technology"].unique()
+    tech_matches = {}
+    for atb_tech, eia_tech in tech_map.items():
+        matches = [t for t in unique_techs if atb_tech in t]
+        if matches:
+            tech_matches[matches[0]] = eia_tech
+
+    # Missing technology multipliers are the average of the cost region
+    tech_multipliers = regional_multipliers.T.fillna(
+        regional_multipliers.mean(axis=1)
+    ).T
+
+    # Look up every (cost region, multiplier technology) pair by position at once
+    cost_regions = [region_map[region] for region in df["region"]]
+    row_idx = tech_multipliers.index.get_indexer(cost_regions)
+    if (row_idx == -1).any():
+        missing = sorted(set(np.asarray(cost_regions)[row_idx == -1]))
+        raise KeyError(f"No regional cost multipliers for {missing}")
+    missing = set(tech_matches.values()) - set(tech_multipliers.columns)
+    if missing:
+        raise KeyError(f"No regional cost multipliers for {sorted(missing)}")
+    col_idx = tech_multipliers.columns.get_indexer(df["technology"].map(tech_matches))
+
+    mult_series = np.where(
+        col_idx >= 0, tech_multipliers.to_numpy(dtype=float)[row_idx, col_idx], np.nan
+    )
+    df["Inv_cost_per_MWyr"] *= mult_series
+    df["Inv_cost_per_MWhyr"] *= mult_series
+    df["regional_cost_multiplier"] = mult_series
 
     return df
 
@@ -789,24 +894,27 @@ def add_modified_atb_generators(settings, atb_costs_hr, model_year_range):
        'lcoe', 'o_m', 'wacc_nominal', 'heat_rate', 'Cap_size'].
     """
 
-    # copy settings so popped keys aren't removed permenantly
-    _settings = copy.deepcopy(settings)
+    allowed_operators = list(_OP_MAP)
 
-    allowed_operators = ["add", "mul", "truediv", "sub"]
-
-    mod_tech_list = []
-    for name, mod_tech in _settings["modified_atb_new_gen"].items():
+    mod_techs = {}
+    new_gen_types = []
+    for name, _mod_tech in settings["modified_atb_new_gen"].items():
+        # copy the spec so popped keys aren't removed permenantly
+        mod_tech = dict(_mod_tech)
         atb_technology = mod_tech.pop("atb_technology")
         atb_tech_detail = mod_tech.pop("atb_tech_detail")
         atb_cost_case = mod_tech.pop("atb_cost_case")
         size_mw = mod_tech.pop("size_mw")
 
-        new_gen_type = (atb_technology, atb_tech_detail, atb_cost_case, size_mw)
+        new_gen_types.append((atb_technology, atb_tech_detail, atb_cost_case, size_mw))
+        mod_techs[name] = mod_tech
 
-        gen = single_generator_row(atb_costs_hr, new_gen_type, model_year_range)
-        gen["technology"] = mod_tech.pop("new_technology")
-        gen["tech_detail"] = mod_tech.pop("new_tech_detail", "")
-        gen["cost_case"] = mod_tech.pop("new_cost_case")
+    # All base ATB rows are averaged in one pass, then modified row by row
+    mod_gens = _batch_generator_rows(atb_costs_hr, new_gen_types, model_year_range)
+    for i, (name, mod_tech) in enumerate(mod_techs.items()):
+        mod_gens.at[i, "technology"] = mod_tech.pop("new_technology")
+        mod_gens.at[i, "tech_detail"] = mod_tech.pop("new_tech_detail", "")
+        mod_gens.at[i, "cost_case"] = mod_tech.pop("new_cost_case")
 
         for parameter, op_list in mod_tech.items():
             assert len(op_list) == 2, (
@@ -815,7 +923,7 @@ def add_modified_atb_generators(settings, atb_costs_hr, model_year_range):
             )
             op, op_value = op_list
 
-            assert parameter in gen.columns, (
+            assert parameter in mod_gens.columns, (
                 f"'{parameter}' is not a valid parameter for new resources. Check '{name}'\n"
                 "in 'modified_atb_new_gen' of the settings file."
             )
@@ -825,12 +933,7 @@ def add_modified_atb_generators(settings, atb_costs_hr, model_year_range):
                 "in the format [<operator>, <value>] to modify the properties of an existing generator.\n"
             )
 
-            f = operator.attrgetter(op)
-            gen[parameter] = f(operator)(gen[parameter], op_value)
-
-        mod_tech_list.append(gen)
-
-    mod_gens = pd.concat(mod_tech_list, ignore_index=True)
+            mod_gens.at[i, parameter] = _OP_MAP[op](mod_gens.at[i, parameter], op_value)
 
     return mod_gens
 
@@ -869,18 +972,17 @@ def atb_new_generators(atb_costs, atb_hr, settings):
         model_year_range = list(range(model_year + 1))
 
     regions = settings["model_regions"]
+    if not regions:
+        raise ValueError(
+            "The settings parameter 'model_regions' doesn't have any regions"
+        )
 
     atb_costs_hr = atb_costs.merge(
         atb_hr, on=["technology", "tech_detail", "basis_year"], how="left"
     )
 
-    new_gen_df = pd.concat(
-        [
-            single_generator_row(atb_costs_hr, new_gen, model_year_range)
-            for new_gen in new_gen_types
-        ],
-        ignore_index=True,
-    )
+    new_gen_df = _batch_generator_rows(atb_costs_hr, new_gen_types, model_year_range)
+    gen_dfs = [new_gen_df]
     # Add user-defined technologies
     # This should probably be separate from ATB techs, and the regional cost multipliers
     # should be its own function.
@@ -889,9 +991,7 @@ def atb_new_generators(atb_costs, atb_hr, settings):
             # user_costs, user_hr = load_user_defined_techs(settings)
             user_tech = load_user_defined_techs(settings)
             # new_gen_df = pd.concat([new_gen_df, user_costs], ignore_index=True, sort=False)
-            new_gen_df = pd.concat(
-                [new_gen_df, user_tech], ignore_index=True, sort=False
-            )
+            gen_dfs.append(user_tech)
             # atb_hr = pd.concat([atb_hr, user_hr], ignore_index=True, sort=False)
         else:
             logger.warning(
@@ -903,9 +1003,10 @@ def atb_new_generators(atb_costs, atb_hr, settings):
         modified_gens = add_modified_atb_generators(
             settings, atb_costs_hr, model_year_range
         )
-        new_gen_df = pd.concat(
-            [new_gen_df, modified_gens], ignore_index=True, sort=False
-        )
+        gen_dfs.append(modified_gens)
+
+    if len(gen_dfs) > 1:
+        new_gen_df = pd.concat(gen_dfs, ignore_index=True, sort=False)
 
     new_gen_df = new_gen_df.rename(
         columns={
@@ -920,12 +1021,12 @@ def atb_new_generators(atb_costs, atb_hr, settings):
     # ATB average of advanced and conventional.
     # This is now generalized for changes to ATB values for any technology type.
     for tech, _tech_modifiers in (settings.get("atb_modifiers") or {}).items():
-        tech_modifiers = copy.deepcopy(_tech_modifiers)
-        assert isinstance(tech_modifiers, dict), (
+        assert isinstance(_tech_modifiers, dict), (
             "The settings parameter 'atb_modifiers' must be a nested list.\n"
             "Each top-level key is a short name of the technology, with a nested"
             " dictionary of items below it."
         )
+        tech_modifiers = dict(_tech_modifiers)
         assert (
             "technology" in tech_modifiers
         ), "Each nested dictionary in atb_modifiers must have a 'technology' key."
@@ -935,8 +1036,12 @@ def atb_new_generators(atb_costs, atb_hr, settings):
 
         technology = tech_modifiers.pop("technology")
         tech_detail = tech_modifiers.pop("tech_detail")
+        mask = (new_gen_df.technology == technology) & (
+            new_gen_df.tech_detail == tech_detail
+        )
+        rows = np.flatnonzero(mask.to_numpy())
 
-        allowed_operators = ["add", "mul", "truediv", "sub"]
+        allowed_operators = list(_OP_MAP)
 
         for key, op_list in tech_modifiers.items():
 
@@ -952,32 +1057,25 @@ def atb_new_generators(atb_costs, atb_hr, settings):
                 "in the format [<operator>, <value>] to modify the properties of an existing generator.\n"
             )
 
-            f = operator.attrgetter(op)
-            new_gen_df.loc[
-                (new_gen_df.technology == technology)
-                & (new_gen_df.tech_detail == tech_detail),
-                key,
-            ] = f(operator)(
-                new_gen_df.loc[
-                    (new_gen_df.technology == technology)
-                    & (new_gen_df.tech_detail == tech_detail),
-                    key,
-                ],
-                op_value,
+            col = new_gen_df.columns.get_loc(key)
+            new_gen_df.iloc[rows, col] = _OP_MAP[op](
+                new_gen_df.iloc[rows, col].to_numpy(), op_value
             )
 
-    new_gen_df["technology"] = (
-        new_gen_df[["technology", "tech_detail", "cost_case"]]
-        .astype(str)
-        .agg("_".join, axis=1)
-    )
+    new_gen_df["technology"] = [
+        f"{tech}_{tech_detail}_{cost_case}"
+        for tech, tech_detail, cost_case in zip(
+            new_gen_df["technology"], new_gen_df["tech_detail"], new_gen_df["cost_case"]
+        )
+    ]
 
     new_gen_df["cap_recovery_years"] = settings["atb_cap_recovery_years"]
 
+    # Keys are lowercased and matched as regular expressions against lowercased names
+    tech_lower = new_gen_df["technology"].str.lower()
     for tech, years in (settings.get("alt_atb_cap_recovery_years") or {}).items():
         new_gen_df.loc[
-            new_gen_df["technology"].str.lower().str.contains(tech.lower()),
-            "cap_recovery_years",
+            tech_lower.str.contains(tech.lower()), "cap_recovery_years"
         ] = years
 
     new_gen_df["Inv_cost_per_MWyr"] = investment_cost_calculator(
@@ -1011,15 +1109,13 @@ def atb_new_generators(atb_costs, atb_hr, settings):
     # Set no capacity limit on new resources that aren't renewables.
     new_gen_df["Max_Cap_MW"] = -1
 
-    regional_cost_multipliers = pd.read_csv(
-        DATA_PATHS["cost_multipliers"] / "AEO_2020_regional_cost_corrections.csv",
-        index_col=0,
+    regional_cost_multipliers = _load_regional_cost_multipliers(
+        DATA_PATHS["cost_multipliers"] / "AEO_2020_regional_cost_corrections.csv"
     )
     if settings.get("user_regional_cost_multiplier_fn"):
-        user_cost_multipliers = pd.read_csv(
+        user_cost_multipliers = _load_regional_cost_multipliers(
             Path(settings["input_folder"])
-            / settings["user_regional_cost_multiplier_fn"],
-            index_col=0
+            / settings["user_regional_cost_multiplier_fn"]
         )
         regional_cost_multipliers = pd.concat(
             [regional_cost_multipliers, user_cost_multipliers], axis=1
@@ -1028,23 +1124,31 @@ def atb_new_generators(atb_costs, atb_hr, settings):
     rev_mult_tech_map = reverse_dict_of_lists(
         settings["cost_multiplier_technology_map"]
     )
+
+    # Repeat the new resources for every region in a single frame and apply the
+    # regional cost multipliers to all of it at once.
+    num_gens = len(new_gen_df)
+    new_gen_df = new_gen_df.iloc[np.tile(np.arange(num_gens), len(regions))]
+    new_gen_df = new_gen_df.reset_index(drop=True)
+    new_gen_df["region"] = np.repeat(np.asarray(regions, dtype=object), num_gens)
+    new_gen_df = regional_capex_multiplier(
+        new_gen_df, rev_mult_region_map, rev_mult_tech_map, regional_cost_multipliers
+    )
+
+    scenarios_by_region = group_scenarios_by_region(settings)
     df_list = []
-    for region in regions:
-        _df = new_gen_df.copy()
-        _df["region"] = region
-        _df = regional_capex_multiplier(
-            _df,
-            region,
-            rev_mult_region_map,
-            rev_mult_tech_map,
-            regional_cost_multipliers,
-        )
-        _df = add_renewables_clusters(_df, region, settings)
+    # Work through the regions by position so that a region listed more than once
+    # gets its own block of resources, as it would when built one region at a time.
+    for i, region in enumerate(regions):
+        _df = new_gen_df.iloc[i * num_gens : (i + 1) * num_gens]
+        _df = add_renewables_clusters(_df, region, settings, scenarios_by_region)
 
         if region in (settings.get("new_gen_not_available") or {}):
             techs = settings["new_gen_not_available"][region]
-            for tech in techs:
-                _df = _df.loc[~_df["technology"].str.contains(tech), :]
+            # Each tech is a regex pattern, so combine them into a single pattern
+            pattern = "|".join(f"(?:{tech})" for tech in techs)
+            if pattern:
+                _df = _df.loc[~_df["technology"].str.contains(pattern), :]
 
         df_list.append(_df)
 
@@ -1057,15 +1161,30 @@ def atb_new_generators(atb_costs, atb_hr, settings):
         "Inv_cost_per_MWhyr",
         "cluster",
     ]
+    # Columns that only exist for some resources (e.g. renewables cluster columns)
+    # are expected to be 0 rather than missing for the others.
     results = results.fillna(0)
-    results[int_cols] = results[int_cols].astype(int)
-    results["Var_OM_cost_per_MWh"] = results["Var_OM_cost_per_MWh"].astype(float)
+    results[int_cols] = results[int_cols].to_numpy(dtype=np.int64)
+    if results["Var_OM_cost_per_MWh"].dtype != np.float64:
+        results["Var_OM_cost_per_MWh"] = results["Var_OM_cost_per_MWh"].astype(float)
 
     return results
 
 
+def group_scenarios_by_region(settings: dict) -> Dict[str, List[dict]]:
+    """Group the `renewables_clusters` scenarios in settings by model region."""
+    scenarios_by_region = {}
+    for scenario in settings.get("renewables_clusters") or []:
+        scenarios_by_region.setdefault(scenario["region"], []).append(scenario)
+
+    return scenarios_by_region
+
+
 def add_renewables_clusters(
-    df: pd.DataFrame, region: str, settings: dict
+    df: pd.DataFrame,
+    region: str,
+    settings: dict,
+    scenarios_by_region: Optional[Dict[str, List[dict]]] = None,
 ) -> pd.DataFrame:
     """
     Add renewables clusters
@@ -1083,6 +1202,9 @@ def add_renewables_clusters(
         Dictionary with the following keys:
             - `renewables_clusters`: Determines the clusters built for the region.
             - `region_aggregations`: Maps the model region to IPM regions.
+    scenarios_by_region
+        Renewables cluster scenarios grouped by model region. Built from
+        `renewables_clusters` in the settings if not provided.
 
     Returns
     -------
@@ -1103,11 +1225,15 @@ def add_renewables_clusters(
         raise ValueError(
             f"NREL ATB technologies are not unique: {df['technology'].to_list()}"
         )
-    atb_map = {
-        x: map_nrel_atb_technology(x.split("_")[0], x.split("_")[1])
-        for x in df["technology"]
-    }
-    mask = df["technology"].isin([tech for tech, match in atb_map.items() if match]) & (
+    # Split each name once and keep only technologies that match an NREL ATB
+    # technology, which are the only ones scenarios can match below.
+    atb_matches = []
+    for tech in df["technology"]:
+        parts = tech.split("_", 2)
+        match = map_nrel_atb_technology(parts[0], parts[1])
+        if match:
+            atb_matches.append((tech, match))
+    mask = df["technology"].isin([tech for tech, _ in atb_matches]) & (
         df["region"] == region
     )
     cdfs = []
@@ -1115,14 +1241,23 @@ def add_renewables_clusters(
         ipm_regions = settings.get("region_aggregations", {})[region]
     else:
         ipm_regions = [region]
-    for scenario in settings.get("renewables_clusters", []):
-        if scenario["region"] != region:
-            continue
+    if scenarios_by_region is None:
+        scenarios_by_region = group_scenarios_by_region(settings)
+    # Index technologies by the values of their match fields, grouped by the
+    # set of fields, so each scenario is matched with one lookup per field set
+    techs_by_signature = {}
+    for tech, match in atb_matches:
+        keys = tuple(sorted(match))
+        values = tuple(match[k] for k in keys)
+        techs_by_signature.setdefault(keys, {}).setdefault(values, []).append(tech)
+    # Technologies are unique, so each one is a single row of the indexed frame
+    tech_rows = df.set_index("technology", drop=False)
+    for scenario in scenarios_by_region.get(region, []):
         # Match cluster technology to NREL ATB technologies
         technologies = [
-            k
-            for k, v in atb_map.items()
-            if v and all([scenario.get(ki) == vi for ki, vi in v.items()])
+            tech
+            for keys, techs in techs_by_signature.items()
+            for tech in techs.get(tuple(scenario.get(k) for k in keys), [])
         ]
         if not technologies:
             raise ValueError(
@@ -1156,7 +1291,6 @@ def add_renewables_clusters(
                     + f" in region {region}"
                     + f" less than minimum ({capacity} < {scenario['min_capacity']} MW)"
                 )
-        row = df[df["technology"] == technology].to_dict("records")[0]
         new_tech_name = "_".join(
             [
                 str(v)
@@ -1165,8 +1299,14 @@ def add_renewables_clusters(
             ]
         )
         clusters["technology"] = clusters["technology"] + "_" + new_tech_name
-        kwargs = {k: v for k, v in row.items() if k not in clusters}
-        cdfs.append(clusters.assign(**kwargs))
+        # Repeat the base resource row for every cluster, keeping column dtypes
+        base_cols = [c for c in tech_rows.columns if c not in clusters]
+        base_values = tech_rows.iloc[
+            np.full(len(clusters), tech_rows.index.get_loc(technology)),
+            tech_rows.columns.get_indexer(base_cols),
+        ]
+        base_values.index = clusters.index
+        cdfs.append(pd.concat([clusters, base_values], axis=1))
     return pd.concat([df[~mask]] + cdfs, sort=False)
 
 
@@ -3,6 +3,7 @@ import copy
 import logging
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime as dt
 from pathlib import Path
 
@@ -40,6 +41,7 @@ from powergenome.external_data import make_generator_variability
 from powergenome.util import (
     build_scenario_settings,
     check_settings,
+    freeze_settings,
     init_pudl_connection,
     load_settings,
     remove_fuel_scenario_name,
@@ -53,6 +55,141 @@ if not sys.warnoptions:
 
     warnings.simplefilter("ignore")
 
+# Settings read while creating generator clusters and load curves. Cases with the
+# same values for these keys reuse clusters or load curves from an earlier case.
+GENERATOR_CLUSTER_SETTINGS = (
+    "additional_new_gen",
+    "additional_planned",
+    "additional_retirements",
+    "additional_technologies_fn",
+    "aeo_fuel_region_map",
+    "aeo_fuel_scenarios",
+    "aeo_fuel_usd_year",
+    "alt_atb_cap_recovery_years",
+    "alt_cluster_method",
+    "alt_num_clusters",
+    "alt_year_filters",
+    "atb_battery_wacc",
+    "atb_cap_recovery_years",
+    "atb_data_year",
+    "atb_existing_year",
+    "atb_financial_case",
+    "atb_modifiers",
+    "atb_new_gen",
+    "capacity_col",
+    "capacity_factor_default_year_filter",
+    "capacity_factor_techs",
+    "capacity_limit_spur_fn",
+    "case_genx_settings_fn",
+    "ccs_fuel_map",
+    "cluster_by_owner_regions",
+    "cost_multiplier_region_map",
+    "cost_multiplier_technology_map",
+    "data_years",
+    "default_model_tag",
+    "demand_response",
+    "demand_response_fn",
+    "demand_response_resources",
+    "demand_segments_fn",
+    "derate_capacity",
+    "derate_techs",
+    "eia_860m_fn",
+    "eia_aeo_year",
+    "eia_atb_tech_map",
+    "eia_series_fuel_names",
+    "eia_series_region_names",
+    "eia_series_scenario_names",
+    "electrification",
+    "emission_policies_fn",
+    "existing_startup_costs_tech_map",
+    "generator_columns",
+    "group_technologies",
+    "input_folder",
+    "model_first_planning_year",
+    "model_regions",
+    "model_tag_names",
+    "model_tag_values",
+    "model_year",
+    "modified_atb_new_gen",
+    "new_build_startup_costs",
+    "new_gen_not_available",
+    "num_clusters",
+    "plant_region_map_fn",
+    "proposed_gen_heat_rates",
+    "proposed_min_load",
+    "proposed_status_included",
+    "pv_ac_dc_ratio",
+    "region_aggregations",
+    "region_wind_pv_cap_fn",
+    "regional_load_fn",
+    "regional_no_grouping",
+    "regional_tag_values",
+    "renewables_clusters",
+    "retirement_ages",
+    "scenario_definitions_fn",
+    "small_hydro",
+    "small_hydro_mw",
+    "small_hydro_regions",
+    "startup_costs_per_cold_start_usd_year",
+    "startup_costs_type",
+    "startup_fuel_use",
+    "startup_vom_costs_mw",
+    "startup_vom_costs_usd_year",
+    "target_usd_year",
+    "tech_fuel_map",
+    "tech_groups",
+    "transmission_investment_cost",
+    "user_region_geodata_fn",
+    "user_regional_cost_multiplier_fn",
+    "utc_offset",
+)
+
+LOAD_CURVE_SETTINGS = (
+    "aeo_fuel_usd_year",
+    "alt_growth_rate",
+    "avg_distribution_loss",
+    "capacity_limit_spur_fn",
+    "case_genx_settings_fn",
+    "demand_response",
+    "demand_response_fn",
+    "demand_response_resources",
+    "demand_segments_fn",
+    "distributed_gen_method",
+    "distributed_gen_profiles_fn",
+    "distributed_gen_values",
+    "eia_aeo_year",
+    "eia_series_fuel_names",
+    "eia_series_region_names",
+    "eia_series_scenario_names",
+    "electrification",
+    "emission_policies_fn",
+    "future_load_region_map",
+    "growth_scenario",
+    "historical_load_region_maps",
+    "input_folder",
+    "model_regions",
+    "model_year",
+    "region_aggregations",
+    "region_wind_pv_cap_fn",
+    "regional_load_fn",
+    "regional_load_includes_demand_response",
+    "regular_load_growth_start_year",
+    "scenario_definitions_fn",
+    "target_usd_year",
+    "utc_offset",
+)
+
+
+def settings_cache_key(settings: dict, keys: tuple) -> tuple:
+    "Frozen values of the settings in `keys`, for use as a cache key"
+    return freeze_settings({k: settings[k] for k in keys if k in settings})
+
+
+def generator_clusters_cache_key(settings: dict) -> tuple:
+    "Cache key for generator clusters, including the startup costs setting in use"
+    keys = GENERATOR_CLUSTER_SETTINGS + (settings.get("startup_costs_type"),)
+    return settings_cache_key(settings, keys)
+
 
 def parse_command_line(argv):
     """
@@ -202,289 +339,332 @@ def main():
     # Build a dictionary of settings for every planning year and case_id
     scenario_settings = build_scenario_settings(settings, scenario_definitions)
 
-    i = 0
-    model_regions_gdf = None
-    for year in scenario_settings:
-        for case_id, _settings in scenario_settings[year].items():
-            case_folder = (
-                out_folder / f"{year}" / f"{case_id}_{year}_{_settings['case_name']}"
-            )
-
-            if i == 0:
-                if args.gens:
-                    gc = GeneratorClusters(
-                        pudl_engine=pudl_engine,
-                        pudl_out=pudl_out,
-                        settings=_settings,
-                        current_gens=args.current_gens,
-                        sort_gens=args.sort_gens,
-                    )
-                    gen_clusters = gc.create_all_generators()
-                    if args.fuel and args.gens:
+    # Results files don't depend on each other, so each case writes them in background
+    # threads and waits for them to finish before moving on to the next case.
+    executor = ThreadPoolExecutor(max_workers=4)
+    pending_writes = []
+
+    def submit_results_file(**kwargs):
+        pending_writes.append(executor.submit(write_results_file, **kwargs))
+
+    try:
+        i = 0
+        model_regions_gdf = None
+        gen_clusters_cache = {}
+        load_cache = {}
+        for year in scenario_settings:
+            for case_id, _settings in scenario_settings[year].items():
+                case_folder = (
+                    out_folder
+                    / f"{year}"
+                    / f"{case_id}_{year}_{_settings['case_name']}"
+                )
+                # The fuel table is built once per case and reused for partial CES
+                # values and the Fuels_data file.
+                fuels = None
+
+                if i == 0:
+                    if args.gens:
+                        gc = GeneratorClusters(
+                            pudl_engine=pudl_engine,
+                            pudl_out=pudl_out,
+                            settings=_settings,
+                            current_gens=args.current_gens,
+                            sort_gens=args.sort_gens,
+                        )
+                        gen_clusters = gc.create_all_generators()
+                        gen_key = generator_clusters_cache_key(_settings)
+                        gen_clusters_cache[gen_key] = gen_clusters.copy()
                         fuels = fuel_cost_table(
                             fuel_costs=gc.fuel_prices,
                             generators=gc.all_resources,
                             settings=_settings,
                         )
-                        fuels["fuel_indices"] = range(1, len(fuels) + 1)
-                        # fuels = remove_fuel_scenario_name(fuels, _settings)
-                        write_results_file(
-                            df=remove_fuel_scenario_name(fuels, _settings),
+
+                        # gen_clusters = remove_fuel_scenario_name(gen_clusters, _settings)
+                        gen_clusters["zone"] = gen_clusters["region"].map(zone_num_map)
+                        gen_clusters = add_misc_gen_values(gen_clusters, _settings)
+                        # gen_clusters = set_int_cols(gen_clusters)
+                        # gen_clusters = gen_clusters.fillna(value=0)
+
+                        # Save existing resources that aren't demand response for use in
+                        # other cases
+                        existing_gens = gc.existing_resources.copy()
+                        # gen_clusters.loc[
+                        #     (gen_clusters["Existing_Cap_MW"] >= 0)
+                        #     & (gen_clusters["DR"] == 0),
+                        #     :,
+                        # ]
+                        logger.info(
+                            f"Finished first round with year {year} scenario {case_id}"
+                        )
+                        # if settings.get("partial_ces"):
+                        gen_variability = make_generator_variability(gen_clusters)
+                        gen_variability.columns = (
+                            gen_clusters["region"]
+                            + "_"
+                            + gen_clusters["Resource"]
+                            + "_"
+                            + gen_clusters["cluster"].astype(str)
+                        )
+                        gens = calculate_partial_CES_values(
+                            gen_clusters, fuels, _settings
+                        ).pipe(fix_min_power_values, gen_variability)
+                        cols = [c for c in _settings["generator_columns"] if c in gens]
+
+                        submit_results_file(
+                            df=remove_fuel_scenario_name(
+                                gens[cols].fillna(0), _settings
+                            )
+                            .pipe(set_int_cols)
+                            .pipe(round_col_values),
                             folder=case_folder,
-                            file_name="Fuels_data.csv",
+                            file_name="Generators_data.csv",
+                            include_index=False,
                         )
+                        # else:
+                        #     write_results_file(
+                        #         df=gen_clusters.fillna(0),
+                        #         folder=case_folder,
+                        #         file_name="Generators_data.csv",
+                        #         include_index=False,
+                        #     )
+
+                        # write_results_file(
+                        #     df=gen_variability,
+                        #     folder=case_folder,
+                        #     file_name="Generators_variability.csv",
+                        #     include_index=True,
+                        # )
+
+                        i += 1
+                    if args.transmission:
+                        if args.gens is False:
+                            model_regions_gdf = load_ipm_shapefile(_settings)
+                        else:
+                            model_regions_gdf = gc.model_regions_gdf
+                            transmission = agg_transmission_constraints(
+                                pudl_engine=pudl_engine, settings=_settings
+                            )
+                            transmission = (
+                                transmission.pipe(
+                                    transmission_line_distance,
+                                    ipm_shapefile=model_regions_gdf,
+                                    settings=_settings,
+                                    units="mile",
+                                )
+                                .pipe(network_line_loss, settings=_settings)
+                                .pipe(network_max_reinforcement, settings=_settings)
+                                .pipe(network_reinforcement_cost, settings=_settings)
+                            )
 
-                    # gen_clusters = remove_fuel_scenario_name(gen_clusters, _settings)
-                    gen_clusters["zone"] = gen_clusters["region"].map(zone_num_map)
-                    gen_clusters = add_misc_gen_values(gen_clusters, _settings)
-                    # gen_clusters = set_int_cols(gen_clusters)
-                    # gen_clusters = gen_clusters.fillna(value=0)
-
-                    # Save existing resources that aren't demand response for use in
-                    # other cases
-                    existing_gens = gc.existing_resources.copy()
-                    # gen_clusters.loc[
-                    #     (gen_clusters["Existing_Cap_MW"] >= 0)
-                    #     & (gen_clusters["DR"] == 0),
-                    #     :,
-                    # ]
-                    logger.info(
-                        f"Finished first round with year {year} scenario {case_id}"
-                    )
-                    # if settings.get("partial_ces"):
-                    gen_variability = make_generator_variability(gen_clusters)
-                    gen_variability.columns = (
-                        gen_clusters["region"]
-                        + "_"
-                        + gen_clusters["Resource"]
-                        + "_"
-                        + gen_clusters["cluster"].astype(str)
-                    )
-                    gens = calculate_partial_CES_values(
-                        gen_clusters, fuels, _settings
-                    ).pipe(fix_min_power_values, gen_variability)
-                    cols = [c for c in _settings["generator_columns"] if c in gens]
-
-                    write_results_file(
-                        df=remove_fuel_scenario_name(gens[cols].fillna(0), _settings)
-                        .pipe(set_int_cols)
-                        .pipe(round_col_values),
-                        folder=case_folder,
-                        file_name="Generators_data.csv",
-                        include_index=False,
-                    )
-                    # else:
-                    #     write_results_file(
-                    #         df=gen_clusters.fillna(0),
-                    #         folder=case_folder,
-                    #         file_name="Generators_data.csv",
-                    #         include_index=False,
-                    #     )
-
-                    # write_results_file(
-                    #     df=gen_variability,
+                    # genx_settings = make_genx_settings_file(pudl_engine, _settings)
+                    # write_case_settings_file(
+                    #     settings=genx_settings,
                     #     folder=case_folder,
-                    #     file_name="Generators_variability.csv",
-                    #     include_index=True,
+                    #     file_name="GenX_settings.yml",
                     # )
 
-                    i += 1
-                if args.transmission:
-                    if args.gens is False:
-                        model_regions_gdf = load_ipm_shapefile(_settings)
-                    else:
-                        model_regions_gdf = gc.model_regions_gdf
-                        transmission = agg_transmission_constraints(
-                            pudl_engine=pudl_engine, settings=_settings
+                else:
+                    logger.info(f"\nStarting year {year} scenario {case_id}")
+                    if args.gens:
+
+                        gc.settings = _settings
+                        # gc.current_gens = False
+
+                        # Change the fuel labels in existing generators to reflect the
+                        # correct AEO scenario for each fuel and update GenX tags based
+                        # on settings.
+                        # gc.existing_resources = existing_gens.pipe(
+                        #     add_fuel_labels, gc.fuel_prices, _settings
+                        # ).pipe(add_genx_model_tags, _settings)
+
+                        gen_key = generator_clusters_cache_key(_settings)
+                        if gen_key in gen_clusters_cache:
+                            logger.info(
+                                "Reusing generator clusters from a previous case"
+                            )
+                            gc.all_resources = gen_clusters_cache[gen_key].copy()
+                            gen_clusters = gc.all_resources
+                        else:
+                            gen_clusters = gc.create_all_generators()
+                            gen_clusters_cache[gen_key] = gen_clusters.copy()
+                        # if settings.get("partial_ces"):
+                        #     fuels = fuel_cost_table(
+                        #         fuel_costs=gc.fuel_prices,
+                        #         generators=gc.all_resources,
+                        #         settings=_settings,
+                        #     )
+                        #     gen_clusters = calculate_partial_CES_values(
+                        #         gen_clusters, fuels, _settings
+                        #     )
+
+                        gen_clusters = add_misc_gen_values(gen_clusters, _settings)
+                        gen_clusters = set_int_cols(gen_clusters)
+                        # gen_clusters = gen_clusters.fillna(value=0)
+
+                        # gen_clusters = remove_fuel_scenario_name(gen_clusters, _settings)
+                        gen_clusters["zone"] = gen_clusters["region"].map(zone_num_map)
+
+                        fuels = fuel_cost_table(
+                            fuel_costs=gc.fuel_prices,
+                            generators=gc.all_resources,
+                            settings=_settings,
                         )
-                        transmission = (
-                            transmission.pipe(
-                                transmission_line_distance,
-                                ipm_shapefile=model_regions_gdf,
-                                settings=_settings,
-                                units="mile",
+                        gen_variability = make_generator_variability(gen_clusters)
+                        gen_variability.columns = (
+                            gen_clusters["region"]
+                            + "_"
+                            + gen_clusters["Resource"]
+                            + "_"
+                            + gen_clusters["cluster"].astype(str)
+                        )
+                        gens = calculate_partial_CES_values(
+                            gen_clusters, fuels, _settings
+                        ).pipe(fix_min_power_values, gen_variability)
+                        cols = [c for c in _settings["generator_columns"] if c in gens]
+                        submit_results_file(
+                            df=remove_fuel_scenario_name(
+                                gens[cols].fillna(0), _settings
                             )
-                            .pipe(network_line_loss, settings=_settings)
-                            .pipe(network_max_reinforcement, settings=_settings)
-                            .pipe(network_reinforcement_cost, settings=_settings)
+                            .pipe(set_int_cols)
+                            .pipe(round_col_values),
+                            folder=case_folder,
+                            file_name="Generators_data.csv",
+                            include_index=False,
                         )
-
-                # genx_settings = make_genx_settings_file(pudl_engine, _settings)
-                # write_case_settings_file(
-                #     settings=genx_settings,
-                #     folder=case_folder,
-                #     file_name="GenX_settings.yml",
-                # )
-
-            else:
-                logger.info(f"\nStarting year {year} scenario {case_id}")
-                if args.gens:
-
-                    gc.settings = _settings
-                    # gc.current_gens = False
-
-                    # Change the fuel labels in existing generators to reflect the
-                    # correct AEO scenario for each fuel and update GenX tags based
-                    # on settings.
-                    # gc.existing_resources = existing_gens.pipe(
-                    #     add_fuel_labels, gc.fuel_prices, _settings
-                    # ).pipe(add_genx_model_tags, _settings)
-
-                    gen_clusters = gc.create_all_generators()
-                    # if settings.get("partial_ces"):
-                    #     fuels = fuel_cost_table(
-                    #         fuel_costs=gc.fuel_prices,
-                    #         generators=gc.all_resources,
-                    #         settings=_settings,
-                    #     )
-                    #     gen_clusters = calculate_partial_CES_values(
-                    #         gen_clusters, fuels, _settings
-                    #     )
-
-                    gen_clusters = add_misc_gen_values(gen_clusters, _settings)
-                    gen_clusters = set_int_cols(gen_clusters)
-                    # gen_clusters = gen_clusters.fillna(value=0)
-
-                    # gen_clusters = remove_fuel_scenario_name(gen_clusters, _settings)
-                    gen_clusters["zone"] = gen_clusters["region"].map(zone_num_map)
-
-                    fuels = fuel_cost_table(
-                        fuel_costs=gc.fuel_prices,
-                        generators=gc.all_resources,
-                        settings=_settings,
-                    )
-                    gen_variability = make_generator_variability(gen_clusters)
-                    gen_variability.columns = (
-                        gen_clusters["region"]
-                        + "_"
-                        + gen_clusters["Resource"]
-                        + "_"
-                        + gen_clusters["cluster"].astype(str)
-                    )
-                    gens = calculate_partial_CES_values(
-                        gen_clusters, fuels, _settings
-                    ).pipe(fix_min_power_values, gen_variability)
-                    cols = [c for c in _settings["generator_columns"] if c in gens]
-                    write_results_file(
-                        df=remove_fuel_scenario_name(gens[cols].fillna(0), _settings)
-                        .pipe(set_int_cols)
-                        .pipe(round_col_values),
+                        # write_results_file(
+                        #     df=gen_clusters.fillna(0),
+                        #     folder=case_folder,
+                        #     file_name="Generators_data.csv",
+                        # )
+
+                        # write_results_file(
+                        #     df=gen_variability,
+                        #     folder=case_folder,
+                        #     file_name="Generators_variability.csv",
+                        #     include_index=True,
+                        # )
+
+                if args.load:
+                    load_key = settings_cache_key(_settings, LOAD_CURVE_SETTINGS)
+                    if load_key not in load_cache:
+                        load = make_final_load_curves(
+                            pudl_engine=pudl_engine, settings=_settings
+                        )
+                        load.columns = "Load_MW_z" + load.columns.map(zone_num_map)
+                        load_cache[load_key] = load
+                    else:
+                        logger.info("Reusing load curves from a previous case")
+                    load = load_cache[load_key].copy()
+
+                    (
+                        reduced_resource_profile,
+                        reduced_load_profile,
+                        time_series_mapping,
+                    ) = reduce_time_domain(gen_variability, load, _settings)
+                    submit_results_file(
+                        df=reduced_load_profile,
                         folder=case_folder,
-                        file_name="Generators_data.csv",
+                        file_name="Load_data.csv",
                         include_index=False,
                     )
-                    # write_results_file(
-                    #     df=gen_clusters.fillna(0),
-                    #     folder=case_folder,
-                    #     file_name="Generators_data.csv",
-                    # )
+                    submit_results_file(
+                        df=reduced_resource_profile,
+                        folder=case_folder,
+                        file_name="Generators_variability.csv",
+                        include_index=True,
+                    )
+                    if time_series_mapping is not None:
+                        submit_results_file(
+                            df=time_series_mapping,
+                            folder=case_folder,
+                            file_name="time_series_mapping.csv",
+                            include_index=False,
+                        )
 
-                    # write_results_file(
-                    #     df=gen_variability,
-                    #     folder=case_folder,
-                    #     file_name="Generators_variability.csv",
-                    #     include_index=True,
+                if args.transmission:
+                    # if not model_regions_gdf:
+                    #     if args.gens is False:
+                    #         model_regions_gdf = load_ipm_shapefile(_settings)
+                    #     else:
+                    #         model_regions_gdf = gc.model_regions_gdf
+                    # transmission = agg_transmission_constraints(
+                    #     pudl_engine=pudl_engine, settings=_settings
                     # )
+                    transmission = transmission.pipe(
+                        network_max_reinforcement, settings=_settings
+                    ).pipe(network_reinforcement_cost, settings=_settings)
 
-            if args.load:
-                load = make_final_load_curves(
-                    pudl_engine=pudl_engine, settings=_settings
-                )
-                load.columns = "Load_MW_z" + load.columns.map(zone_num_map)
-
-                (
-                    reduced_resource_profile,
-                    reduced_load_profile,
-                    time_series_mapping,
-                ) = reduce_time_domain(gen_variability, load, _settings)
-                write_results_file(
-                    df=reduced_load_profile,
-                    folder=case_folder,
-                    file_name="Load_data.csv",
-                    include_index=False,
-                )
-                write_results_file(
-                    df=reduced_resource_profile,
-                    folder=case_folder,
-                    file_name="Generators_variability.csv",
-                    include_index=True,
-                )
-                if time_series_mapping is not None:
-                    write_results_file(
-                        df=time_series_mapping,
+                    network = add_emission_policies(transmission, _settings)
+
+                    # Change the CES limit for cases where it's emissions based
+                    if "emissions_ces_limit" in _settings:
+                        network = calc_emissions_ces_level(network, load, _settings)
+
+                    # If single-value for CES, use that value for input to GenX
+                    # settings creation. This way values that are calculated internally
+                    # get used.
+                    if network["CES"].std() == 0:
+                        ces = network["CES"].mean()
+                    else:
+                        ces = None
+
+                    submit_results_file(
+                        df=network.pipe(set_int_cols).pipe(round_col_values),
                         folder=case_folder,
-                        file_name="time_series_mapping.csv",
+                        file_name="Network.csv",
                         include_index=False,
                     )
 
-            if args.transmission:
-                # if not model_regions_gdf:
-                #     if args.gens is False:
-                #         model_regions_gdf = load_ipm_shapefile(_settings)
-                #     else:
-                #         model_regions_gdf = gc.model_regions_gdf
-                # transmission = agg_transmission_constraints(
-                #     pudl_engine=pudl_engine, settings=_settings
-                # )
-                transmission = transmission.pipe(
-                    network_max_reinforcement, settings=_settings
-                ).pipe(network_reinforcement_cost, settings=_settings)
-
-                network = add_emission_policies(transmission, _settings)
-
-                # Change the CES limit for cases where it's emissions based
-                if "emissions_ces_limit" in _settings:
-                    network = calc_emissions_ces_level(network, load, _settings)
-
-                # If single-value for CES, use that value for input to GenX
-                # settings creation. This way values that are calculated internally
-                # get used.
-                if network["CES"].std() == 0:
-                    ces = network["CES"].mean()
-                else:
-                    ces = None
-
-                write_results_file(
-                    df=network.pipe(set_int_cols).pipe(round_col_values),
-                    folder=case_folder,
-                    file_name="Network.csv",
-                    include_index=False,
-                )
+                if args.fuel and args.gens:
+                    if fuels is None:
+                        fuels = fuel_cost_table(
+                            fuel_costs=gc.fuel_prices,
+                            generators=gc.all_resources,
+                            settings=_settings,
+                        )
+                    # fuels = remove_fuel_scenario_name(fuels, _settings)
+
+                    # Hack to get around the fact that fuels with different cost names
+                    # get added and end up as duplicates.
+                    fuels = fuels.drop_duplicates(subset=["Fuel"], keep="last")
+                    fuels["fuel_indices"] = range(1, len(fuels) + 1)
+                    submit_results_file(
+                        df=remove_fuel_scenario_name(fuels, _settings)
+                        .pipe(set_int_cols)
+                        .pipe(round_col_values),
+                        folder=case_folder,
+                        file_name="Fuels_data.csv",
+                    )
 
-            if args.fuel and args.gens:
-                fuels = fuel_cost_table(
-                    fuel_costs=gc.fuel_prices,
-                    generators=gc.all_resources,
+                if _settings.get("genx_settings_fn"):
+                    genx_settings = make_genx_settings_file(
+                        pudl_engine, _settings, calculated_ces=ces
+                    )
+                    write_case_settings_file(
+                        settings=genx_settings,
+                        folder=case_folder,
+                        file_name="GenX_settings.yml",
+                    )
+                write_case_settings_file(
                     settings=_settings,
-                )
-                # fuels = remove_fuel_scenario_name(fuels, _settings)
-
-                # Hack to get around the fact that fuels with different cost names
-                # get added and end up as duplicates.
-                fuels = fuels.drop_duplicates(subset=["Fuel"], keep="last")
-                fuels["fuel_indices"] = range(1, len(fuels) + 1)
-                write_results_file(
-                    df=remove_fuel_scenario_name(fuels, _settings)
-                    .pipe(set_int_cols)
-                    .pipe(round_col_values),
                     folder=case_folder,
-                    file_name="Fuels_data.csv",
+                    file_name="powergenome_case_settings.yml",
                 )
 
-            if _settings.get("genx_settings_fn"):
-                genx_settings = make_genx_settings_file(
-                    pudl_engine, _settings, calculated_ces=ces
-                )
-                write_case_settings_file(
-                    settings=genx_settings,
-                    folder=case_folder,
-                    file_name="GenX_settings.yml",
-                )
-            write_case_settings_file(
-                settings=_settings,
-                folder=case_folder,
-                file_name="powergenome_case_settings.yml",
-            )
+                # Raise any errors from writing this case's results files. Futures are
+                # removed before their errors are raised so they aren't reported again.
+                while pending_writes:
+                    pending_writes.pop(0).result()
+    finally:
+        # Wait for results files that are still being written if a case failed, and
+        # report any that couldn't be written.
+        executor.shutdown()
+        for future in pending_writes:
+            exc = future.exception()
+            if exc is not None:
+                logger.error(f"Failed to write a results file: {exc}")
 
 
 if __name__ == "__main__":
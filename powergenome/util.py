@@ -1,7 +1,9 @@
 import collections
 from copy import deepcopy
+import hashlib
 import itertools
 import logging
+import pickle
 import subprocess
 from typing import Dict, Tuple, Union
 
@@ -205,6 +207,48 @@ def update_dictionary(d: dict, u: dict) -> dict:
     return d
 
 
+def freeze_settings(settings: dict, exclude: tuple = ()) -> tuple:
+    """Convert a (nested) settings dictionary into a hashable tuple.
+
+    Parameters
+    ----------
+    settings : dict
+        User-defined parameters from a settings file
+    exclude : tuple, optional
+        Top-level keys to leave out, by default ()
+
+    Returns
+    -------
+    tuple
+        Sorted (key, value) pairs with nested dicts and lists also converted to tuples.
+        Other unhashable values (e.g. arrays) are replaced by a hash of their pickled
+        contents. Two settings dictionaries with the same values give equal tuples.
+    """
+
+    def _freeze(value):
+        if isinstance(value, collections.abc.Mapping):
+            return tuple(
+                sorted(
+                    ((k, _freeze(v)) for k, v in value.items()),
+                    key=lambda item: repr(item[0]),
+                )
+            )
+        if isinstance(value, (list, tuple)):
+            return tuple(_freeze(v) for v in value)
+        if isinstance(value, set):
+            return frozenset(_freeze(v) for v in value)
+        try:
+            hash(value)
+        except TypeError:
+            # A repr can be truncated (e.g. arrays and dataframes), so use a hash of
+            # the full pickled value as a stand-in when used as a cache key.
+            digest = hashlib.sha256(pickle.dumps(value)).hexdigest()
+            return (type(value).__name__, digest)
+        return value
+
+    return _freeze({k: v for k, v in settings.items() if k not in exclude})
+
+
 def remove_fuel_scenario_name(df, settings):
     _df = df.copy()
     scenarios = settings["eia_series_scenario_names"].keys()
@@ -422,8 +466,13 @@ def build_scenario_settings(
                 & (scenario_definitions.year == year),
                 :,
             ]
+            assert len(case_scenario_definitions) == 1, (
+                f"The scenario definitions file has {len(case_scenario_definitions)} "
+                f"rows for case id {case_id} in year {year}. It should only have one."
+            )
+            case_scenario_row = case_scenario_definitions.iloc[0]
             for col in scenario_definitions.columns:
-                _settings[col] = case_scenario_definitions.squeeze().at[col]
+                _settings[col] = case_scenario_row.at[col]
 
             modified_settings = []
             for (
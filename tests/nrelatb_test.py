@@ -0,0 +1,370 @@
+"""Test functions in nrelatb.py"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import sqlalchemy
+from powergenome.nrelatb import (
+    _batch_generator_rows,
+    _cpi_mult,
+    _load_regional_cost_multipliers,
+    atb_fixed_var_om_existing,
+    atb_new_generators,
+    fetch_atb_costs,
+    group_scenarios_by_region,
+    investment_cost_calculator,
+    regional_capex_multiplier,
+)
+
+ATB_COST_CASE_WACC = {"Mid": 0.05, "Low": 0.04}
+
+
+@pytest.fixture(scope="module")
+def atb_cost_engine():
+    "In-memory NREL ATB cost table with two technologies in two cost cases"
+    engine = sqlalchemy.create_engine("sqlite://")
+    engine.execute(
+        """
+        CREATE TABLE technology_costs_nrelatb (
+            technology TEXT,
+            tech_detail TEXT,
+            basis_year INTEGER,
+            financial_case TEXT,
+            cost_case TEXT,
+            atb_year INTEGER,
+            parameter TEXT,
+            parameter_value REAL,
+            dollar_year INTEGER
+        )
+        """
+    )
+    rows = []
+    for technology, tech_detail, capex in [
+        ("UtilityPV", "Class1", 1000000.0),
+        ("OffShoreWind", "OTRG3", 3000000.0),
+    ]:
+        for cost_case, wacc in ATB_COST_CASE_WACC.items():
+            for year in [2030, 2031]:
+                for parameter, value in [
+                    ("capex_mw", capex),
+                    ("fixed_o_m_mw", 20000.0),
+                    ("variable_o_m_mwh", 0.0),
+                ]:
+                    rows.append(
+                        (
+                            technology,
+                            tech_detail,
+                            year,
+                            "Market",
+                            cost_case,
+                            2020,
+                            parameter,
+                            value,
+                            2018,
+                        )
+                    )
+                rows.append(
+                    (
+                        technology,
+                        "*",
+                        year,
+                        "Market",
+                        cost_case,
+                        2020,
+                        "wacc_nominal",
+                        wacc,
+                        2018,
+                    )
+                )
+    engine.execute(
+        "INSERT INTO technology_costs_nrelatb VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+    )
+    return engine
+
+
+@pytest.fixture(scope="module")
+def existing_om_settings():
+    settings = {
+        "eia_atb_tech_map": {
+            "Natural Gas Fired Combined Cycle": "NaturalGas_CCAvgCF",
+            "Other Steam Turbine": "NaturalGas_CTAvgCF",
+        },
+        "tech_groups": {},
+        "atb_existing_year": 2030,
+        "atb_data_year": 2020,
+        "target_usd_year": 2018,
+        "capacity_col": "capacity_mw",
+        "model_year": 2030,
+    }
+    return settings
+
+
+@pytest.fixture(scope="module")
+def atb_hr_data():
+    atb_hr = pd.DataFrame(
+        {
+            "technology": ["NaturalGas"],
+            "tech_detail": ["CCAvgCF"],
+            "basis_year": [2030],
+            "heat_rate": [6.4],
+        }
+    )
+    return atb_hr
+
+
+def existing_plants(technology):
+    "Two generators of a single existing plant"
+    plants = pd.DataFrame(
+        {
+            "plant_id_eia": [1, 1],
+            "technology": [technology, technology],
+            "heat_rate_mmbtu_mwh": [7.0, 7.2],
+            "capacity_mw": [300.0, 300.0],
+        }
+    )
+    return plants
+
+
+def test_fetch_atb_costs_wacc_by_cost_case(atb_cost_engine):
+    new_gen_types = [
+        ["UtilityPV", "Class1", "Mid", 100],
+        ["UtilityPV", "Class1", "Low", 100],
+    ]
+    settings = {
+        "atb_data_year": 2020,
+        "atb_new_gen": new_gen_types,
+        "target_usd_year": 2018,
+    }
+    atb_costs = fetch_atb_costs(atb_cost_engine, settings)
+    atb_costs["heat_rate"] = 0
+
+    rows = _batch_generator_rows(atb_costs, new_gen_types, [2030, 2031])
+
+    assert len(rows) == 2
+    for _, row in rows.iterrows():
+        assert np.allclose(row["wacc_nominal"], ATB_COST_CASE_WACC[row["cost_case"]])
+
+
+def test_fetch_atb_costs_offshore_spur(atb_cost_engine):
+    settings = {
+        "atb_data_year": 2020,
+        "atb_new_gen": [
+            ["UtilityPV", "Class1", "Mid", 100],
+            ["OffShoreWind", "OTRG3", "Mid", 100],
+        ],
+        "target_usd_year": 2018,
+    }
+    offshore_spur_costs = pd.DataFrame(
+        {
+            "technology": "OffShoreWind",
+            "tech_detail": "OTRG3",
+            "cost_case": "Mid",
+            "basis_year": [2030, 2031],
+            "capex_mw": 200000.0,
+        }
+    )
+    atb_costs = fetch_atb_costs(atb_cost_engine, settings, offshore_spur_costs)
+
+    # ATB spur costs are only removed from offshore wind capex
+    offshore = atb_costs["technology"] == "OffShoreWind"
+    assert offshore.sum() == 2
+    assert np.allclose(atb_costs.loc[offshore, "capex_mw"], 2800000.0)
+    assert np.allclose(atb_costs.loc[~offshore, "capex_mw"], 1000000.0)
+
+    # Offshore rows without a spur cost keep their ATB capex
+    atb_costs = fetch_atb_costs(
+        atb_cost_engine, settings, offshore_spur_costs.iloc[[0]]
+    )
+    offshore_capex = atb_costs.loc[
+        atb_costs["technology"] == "OffShoreWind", :
+    ].set_index("basis_year")["capex_mw"]
+    assert np.allclose(offshore_capex[2030], 2800000.0)
+    assert np.allclose(offshore_capex[2031], 3000000.0)
+
+
+def test_investment_cost_calculator_series():
+    capex = pd.Series([1000.0, 2000.0])
+    wacc = pd.Series([0.05, 0.07])
+    cap_rec_years = pd.Series([20, 30])
+
+    inv_cost = investment_cost_calculator(capex, wacc, cap_rec_years)
+
+    expected = (
+        capex
+        * np.exp(wacc * cap_rec_years)
+        * (np.exp(wacc) - 1)
+        / (np.exp(wacc * cap_rec_years) - 1)
+    )
+    assert len(inv_cost) == 2
+    assert np.allclose(inv_cost, expected)
+
+
+def test_investment_cost_calculator_scalar():
+    inv_cost = investment_cost_calculator(1000, 0.05, 20)
+    zero_wacc_inv_cost = investment_cost_calculator(1000, 0, 20)
+
+    assert np.ndim(inv_cost) == 0
+    assert not isinstance(inv_cost, np.ndarray)
+    assert np.allclose(inv_cost, 1000 * np.exp(1) * np.expm1(0.05) / np.expm1(1))
+    assert not isinstance(zero_wacc_inv_cost, np.ndarray)
+    assert np.allclose(zero_wacc_inv_cost, 50)
+
+
+def test_investment_cost_calculator_zero_wacc():
+    inv_cost = investment_cost_calculator(
+        [1000.0, 1000.0], [0, 0.05], np.array([20, 20])
+    )
+
+    assert np.allclose(inv_cost[0], 1000 / 20)
+    assert np.allclose(inv_cost[1], investment_cost_calculator(1000, 0.05, 20))
+
+
+def test_investment_cost_calculator_nan():
+    with pytest.raises(ValueError):
+        investment_cost_calculator([1000.0, np.nan], 0.05, 20)
+
+
+def test_atb_fixed_var_om_existing_nems(
+    atb_cost_engine, atb_hr_data, existing_om_settings
+):
+    results = existing_plants("Natural Gas Fired Combined Cycle")
+
+    df = atb_fixed_var_om_existing(
+        results, atb_hr_data, existing_om_settings, atb_cost_engine
+    )
+
+    # A 600 MW combined cycle plant is in the middle NEMS capacity bin
+    assert df["Fixed_OM_cost_per_MWyr"].dtype == np.int64
+    assert (
+        df["Fixed_OM_cost_per_MWyr"] == np.rint(9.27 * 1000 * _cpi_mult(2017, 2018))
+    ).all()
+    assert np.allclose(df["Var_OM_cost_per_MWh"], 3.42 * _cpi_mult(2017, 2018))
+
+
+def test_atb_fixed_var_om_existing_missing_nems_category(
+    atb_cost_engine, atb_hr_data, existing_om_settings
+):
+    # Contains the NEMS name "Steam Turbine" but isn't a natural gas steam turbine
+    results = existing_plants("Other Steam Turbine")
+
+    with pytest.raises(ValueError, match="Other Steam Turbine"):
+        atb_fixed_var_om_existing(
+            results, atb_hr_data, existing_om_settings, atb_cost_engine
+        )
+
+
+def test_load_regional_cost_multipliers(tmp_path):
+    fn = tmp_path / "regional_cost_multipliers.csv"
+    fn.write_text("cost_region,CT\nCA,1.1\n")
+
+    multipliers = _load_regional_cost_multipliers(fn)
+    multipliers.loc["CA", "CT"] = 5
+
+    # Callers get a copy, so changing it doesn't change the cached frame
+    assert _load_regional_cost_multipliers(fn).loc["CA", "CT"] == 1.1
+
+    # An edited file is read again
+    fn.write_text("cost_region,CT\nCA,1.2\n")
+    mtime_ns = fn.stat().st_mtime_ns + 1_000_000_000
+    os.utime(fn, ns=(mtime_ns, mtime_ns))
+    assert _load_regional_cost_multipliers(fn).loc["CA", "CT"] == 1.2
+
+
+def test_group_scenarios_by_region():
+    scenarios = [
+        {"region": "CA_N", "technology": "landbasedwind", "max_clusters": 1},
+        {"region": "CA_S", "technology": "utilitypv", "max_clusters": 2},
+        {"region": "CA_N", "technology": "utilitypv", "max_clusters": 3},
+    ]
+    settings = {"renewables_clusters": scenarios}
+
+    scenarios_by_region = group_scenarios_by_region(settings)
+
+    assert scenarios_by_region == {
+        "CA_N": [scenarios[0], scenarios[2]],
+        "CA_S": [scenarios[1]],
+    }
+
+
+def test_group_scenarios_by_region_empty():
+    assert group_scenarios_by_region({"renewables_clusters": []}) == {}
+    assert group_scenarios_by_region({"renewables_clusters": None}) == {}
+    assert group_scenarios_by_region({}) == {}
+
+
+@pytest.fixture
+def new_gen_costs():
+    "Investment costs for new resources in two model regions"
+    new_gen = pd.DataFrame(
+        {
+            "technology": [
+                "NaturalGas_CCAvgCF_Mid",
+                "UtilityPV_Class1_Mid",
+                "Nuclear_*_Mid",
+            ]
+            * 2,
+            "region": ["CA_N"] * 3 + ["CA_S"] * 3,
+            "Inv_cost_per_MWyr": 100.0,
+            "Inv_cost_per_MWhyr": 10.0,
+        }
+    )
+    return new_gen
+
+
+@pytest.fixture
+def regional_multipliers():
+    multipliers = pd.DataFrame(
+        {"CC": [1.1, 0.9], "PV": [1.2, np.nan], "CT": [1.0, 1.0]},
+        index=["WECC_N", "WECC_S"],
+    )
+    return multipliers
+
+
+def test_regional_capex_multiplier(new_gen_costs, regional_multipliers):
+    region_map = {"CA_N": "WECC_N", "CA_S": "WECC_S"}
+    tech_map = {"NaturalGas_CCAvgCF": "CC", "UtilityPV": "PV"}
+
+    df = regional_capex_multiplier(
+        new_gen_costs, region_map, tech_map, regional_multipliers
+    )
+
+    # A missing multiplier is the average of the cost region. Technologies that
+    # aren't in the technology map don't get a multiplier.
+    expected = np.array([1.1, 1.2, np.nan, 0.9, 0.95, np.nan])
+    assert np.allclose(df["regional_cost_multiplier"], expected, equal_nan=True)
+    assert np.allclose(df["Inv_cost_per_MWyr"], expected * 100, equal_nan=True)
+    assert np.allclose(df["Inv_cost_per_MWhyr"], expected * 10, equal_nan=True)
+
+
+def test_regional_capex_multiplier_missing_region(new_gen_costs, regional_multipliers):
+    tech_map = {"NaturalGas_CCAvgCF": "CC", "UtilityPV": "PV"}
+
+    with pytest.raises(KeyError):
+        regional_capex_multiplier(
+            new_gen_costs, {"CA_N": "WECC_N"}, tech_map, regional_multipliers
+        )
+    with pytest.raises(KeyError):
+        regional_capex_multiplier(
+            new_gen_costs,
+            {"CA_N": "WECC_N", "CA_S": "WECC_X"},
+            tech_map,
+            regional_multipliers,
+        )
+
+
+def test_regional_capex_multiplier_missing_tech(new_gen_costs, regional_multipliers):
+    region_map = {"CA_N": "WECC_N", "CA_S": "WECC_S"}
+    tech_map = {"NaturalGas_CCAvgCF": "CC", "UtilityPV": "Solar"}
+
+    with pytest.raises(KeyError):
+        regional_capex_multiplier(
+            new_gen_costs, region_map, tech_map, regional_multipliers
+        )
+
+
+def test_atb_new_generators_no_regions():
+    settings = {"atb_new_gen": [], "model_year": 2030, "model_regions": []}
+
+    with pytest.raises(ValueError, match="model_regions"):
+        atb_new_generators(pd.DataFrame(), pd.DataFrame(), settings)
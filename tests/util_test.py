@@ -0,0 +1,109 @@
+"""Test functions in util.py"""
+import numpy as np
+import pandas as pd
+import pytest
+from powergenome.util import build_scenario_settings, freeze_settings
+
+
+@pytest.fixture
+def case_settings(tmp_path):
+    "Settings for two cases in a single planning year"
+    (tmp_path / "case_id_description.csv").write_text(
+        "case_id,case_name\np1,base case\np2,high growth\n"
+    )
+    settings = {
+        "input_folder": tmp_path,
+        "case_id_description_fn": "case_id_description.csv",
+        "model_year": [2030],
+        "model_first_planning_year": [2025],
+        "settings_management": {
+            2030: {
+                "growth": {
+                    "normal": {"growth_rate": 1},
+                    "high": {"growth_rate": 2},
+                }
+            }
+        },
+    }
+    return settings
+
+
+@pytest.fixture
+def scenario_definitions():
+    scenario_definitions = pd.DataFrame(
+        {"case_id": ["p1", "p2"], "year": [2030, 2030], "growth": ["normal", "high"]}
+    )
+    return scenario_definitions
+
+
+def test_build_scenario_settings(case_settings, scenario_definitions):
+    scenario_settings = build_scenario_settings(case_settings, scenario_definitions)
+
+    assert list(scenario_settings[2030]) == ["p1", "p2"]
+    assert scenario_settings[2030]["p1"]["growth_rate"] == 1
+    assert scenario_settings[2030]["p2"]["growth_rate"] == 2
+    assert scenario_settings[2030]["p2"]["growth"] == "high"
+    assert scenario_settings[2030]["p2"]["case_name"] == "high_growth"
+    assert scenario_settings[2030]["p2"]["model_first_planning_year"] == 2025
+
+
+def test_build_scenario_settings_duplicate_case(case_settings, scenario_definitions):
+    scenario_definitions = pd.concat(
+        [scenario_definitions, scenario_definitions.iloc[[0]]], ignore_index=True
+    )
+
+    with pytest.raises(AssertionError, match="case id p1"):
+        build_scenario_settings(case_settings, scenario_definitions)
+
+
+def test_freeze_settings_hashable():
+    settings = {
+        "model_regions": ["CA_N", "CA_S"],
+        "region_aggregations": {"CA_N": ["WEC_CALN"], "CA_S": ["WEC_SCE", "WEC_LADW"]},
+        "atb_new_gen": [["UtilityPV", "LosAngeles", "Mid", 1]],
+        "tags": {"ZERO"},
+        "target_usd_year": 2018,
+    }
+    frozen = freeze_settings(settings)
+
+    assert hash(frozen) == hash(freeze_settings(settings))
+
+
+def test_freeze_settings_key_order():
+    settings = {"a": 1, "b": {"c": [1, 2], "d": "x"}}
+    reordered = {"b": {"d": "x", "c": [1, 2]}, "a": 1}
+
+    assert freeze_settings(settings) == freeze_settings(reordered)
+
+
+def test_freeze_settings_values():
+    settings = {"a": 1, "b": {"c": [1, 2], "d": "x"}}
+
+    assert freeze_settings(settings) != freeze_settings(
+        {"a": 1, "b": {"c": [2, 1], "d": "x"}}
+    )
+    assert freeze_settings(settings) != freeze_settings(
+        {"a": 1, "b": {"c": [1, 2], "d": "y"}}
+    )
+
+
+def test_freeze_settings_exclude():
+    settings = {"case_id": "p1", "case_name": "base", "a": 1}
+    other_case = {"case_id": "p2", "case_name": "high", "a": 1}
+
+    assert freeze_settings(settings, exclude=("case_id", "case_name")) == (
+        freeze_settings(other_case, exclude=("case_id", "case_name"))
+    )
+    assert freeze_settings(settings) != freeze_settings(other_case)
+
+
+def test_freeze_settings_unhashable():
+    # Arrays with the same truncated repr must not give the same frozen settings
+    settings = {"a": np.arange(2000)}
+    changed = np.arange(2000)
+    changed[1000] = -1
+
+    assert hash(freeze_settings(settings)) == hash(
+        freeze_settings({"a": np.arange(2000)})
+    )
+    assert freeze_settings(settings) != freeze_settings({"a": changed})